@@ -1,46 +1,186 @@
 """Multi-step agentic execution loop with completion detection."""
 
+import collections
+import io
+import json
 import re
-from typing import Dict, List, Tuple
+import time
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 
 from rich.console import Console
+from rich.prompt import Prompt
+
+from .context_manager import ToolResultTruncator
+from .scheduler import READ_ONLY_TOOLS, WRITE_TOOLS
 
 console = Console()
 
-try:
-    from .display import DisplayManager
-except ImportError:
-    DisplayManager = None
+# Lets hosted providers cache the long, static agent system prompt across turns
+AGENT_PROMPT_CACHE_KEY = "kubrick-agent-v1"
+
+
+class StreamPrinter:
+    """
+    Coalesces streamed LLM text before writing it to the console.
+
+    Printing every token individually makes Rich render and flush once per
+    chunk, which dominates CPU when the model streams quickly. Text is held
+    until enough has accumulated or a short interval has passed.
+    """
+
+    FLUSH_CHARS = 16384
+    FLUSH_INTERVAL_SECONDS = 0.05
+
+    def __init__(self):
+        """Initialize an empty stream printer."""
+        self.pending = []
+        self.pending_chars = 0
+        self.last_flush = time.monotonic()
 
-try:
-    from .scheduler import ToolScheduler
-except ImportError:
-    ToolScheduler = None
+    def write(self, text: str):
+        """
+        Queue text for display, flushing if the batch is due.
 
-try:
-    from .animated_display import StreamBuffer, ThinkingIndicator, ToolSpinner
-except ImportError:
-    StreamBuffer = None
-    ThinkingIndicator = None
-    ToolSpinner = None
+        Args:
+            text: Streamed text to display
+        """
+        self.pending.append(text)
+        self.pending_chars += len(text)
+
+        if (
+            self.pending_chars >= self.FLUSH_CHARS
+            or time.monotonic() - self.last_flush >= self.FLUSH_INTERVAL_SECONDS
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write any pending text to the console."""
+        if self.pending:
+            # LLM output is written verbatim: console.out skips Rich markup
+            # parsing, so model text like "[bold]" is neither interpreted
+            # nor paid for on every flush.
+            console.out("".join(self.pending), end="", highlight=False)
+            self.pending.clear()
+            self.pending_chars = 0
+        self.last_flush = time.monotonic()
 
 
 class CompletionDetector:
     """Detects when an agent has completed its task."""
 
-    COMPLETION_MARKERS = [
+    COMPLETION_MARKERS = (
         "TASK_COMPLETE",
         "PLAN_COMPLETE",
         "[COMPLETE]",
         "[DONE]",
+    )
+
+    # Phrases indicating the agent is about to START work (not conclusive)
+    STARTING_PATTERNS = [
+        r"\blet'?s? start",
+        r"\bi'?ll (?:start|begin|create|write)",
+        r"\bi'?m (?:going to|about to)",
+        r"\bfirst,? (?:i'?ll|let'?s|we'?ll)",
+        r"\bnext,? (?:i'?ll|let'?s|we'?ll)",
+        r"\bstep \d+",
+        r"\bhere'?s? (?:the |a )?plan",
+        r"\bwe (?:can|will|should) (?:start|begin|create)",
+    ]
+
+    # Expanded patterns to catch genuine completions
+    CONCLUSIVE_PATTERNS = [
+        r"\b(done|completed|finished|ready)\b",
+        r"\b(successfully|all set|good to go)\b",
+        r"\bhere(?:'s| is) (?:the |a )?(?:poem|story|joke)",  # Only for creative content
+        r"\b(?:task|work|changes) (?:is |are )?(?:complete|done|finished)",
+        r"\blet me know if you need",
+        r"\bthat(?:'s| should do it)",
+        r"\beverything(?:'s| is) (?:set|ready|done)",
+        r"\bhope (?:this|that) helps",
+        r"\b(?:enjoy|hope you (?:like|enjoy))",
+        r"\b(?:there you go|here you are)",
+        r"\bfeel free to",
+        r"\bif you (?:need|want) (?:anything|more)",
+    ]
+
+    # Every conclusive phrase contains at least one of these. A substring scan
+    # is much cheaper than the regex, and most intermediate responses contain
+    # none of them, so the regex is skipped for those.
+    CONCLUSIVE_HINTS = (
+        "done",
+        "complet",
+        "finish",
+        "ready",
+        "success",
+        "all set",
+        "good to go",
+        "here",
+        "let me know",
+        "that",
+        "everything",
+        "hope",
+        "enjoy",
+        "there you go",
+        "feel free",
+        "if you",
+    )
+
+    # Shortest text any conclusive pattern can match ("done", "ready")
+    MIN_CONCLUSIVE_LENGTH = 4
+
+    # Conclusive phrases are sign-offs, so only the end of a response is
+    # searched for them
+    CONCLUSIVE_WINDOW = 1024
+
+    # Very specific creative markers - only for actual creative writing
+    CREATIVE_PATTERNS = [
+        r"\b(?:poem|haiku|limerick|sonnet)\b.*\n.*\n",  # Poem with line breaks
+        r"once upon a time",  # Story beginning
+        r"(?:roses are red|twinkle.*little star)",  # Nursery rhymes
     ]
 
+    # Each pattern list is fused into a single alternation compiled once at
+    # class creation, so a check is one regex pass instead of one per pattern.
+    # Matching is case-insensitive so responses never need a lowercased copy.
+    _STARTING_RE = re.compile(
+        "|".join(f"(?:{p})" for p in STARTING_PATTERNS), re.IGNORECASE
+    )
+    _CONCLUSIVE_RE = re.compile(
+        "|".join(f"(?:{p})" for p in CONCLUSIVE_PATTERNS), re.IGNORECASE
+    )
+    _CREATIVE_RE = re.compile(
+        "|".join(f"(?:{p})" for p in CREATIVE_PATTERNS), re.IGNORECASE | re.DOTALL
+    )
+
+    # Completion markers are exact, case-sensitive tokens
+    _MARKER_RE = re.compile("|".join(re.escape(m) for m in COMPLETION_MARKERS))
+    # Characters to carry between streamed chunks so a marker split across a
+    # chunk boundary is still found
+    MARKER_OVERLAP = max(len(m) for m in COMPLETION_MARKERS) - 1
+
+    @staticmethod
+    def find_marker(text: str) -> Optional[str]:
+        """
+        Find the first completion marker in text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            The marker found, or None
+        """
+        marker_match = CompletionDetector._MARKER_RE.search(text)
+        return marker_match.group(0) if marker_match else None
+
     @staticmethod
     def is_complete(
         response_text: str,
         has_tool_calls: bool,
         iteration: int,
         max_iterations: int,
+        explicit_marker: Optional[str] = None,
+        markers_checked: bool = False,
     ) -> Tuple[bool, str]:
         """
         Determine if the agent has completed its task.
@@ -50,17 +190,22 @@ class CompletionDetector:
             has_tool_calls: Whether the response contains tool calls
             iteration: Current iteration number
             max_iterations: Maximum allowed iterations
+            explicit_marker: Marker already found while streaming, if any
+            markers_checked: True if the caller already scanned the whole
+                response for markers, so the scan can be skipped
 
         Returns:
             Tuple of (is_complete, reason)
         """
-        for marker in CompletionDetector.COMPLETION_MARKERS:
-            if marker in response_text:
-                return True, f"explicit_marker:{marker}"
-
+        # Cheap structural check first; no text scanning needed
         if iteration >= max_iterations:
             return True, "max_iterations_reached"
 
+        if explicit_marker is None and not markers_checked:
+            explicit_marker = CompletionDetector.find_marker(response_text)
+        if explicit_marker:
+            return True, f"explicit_marker:{explicit_marker}"
+
         if not has_tool_calls:
             if CompletionDetector._looks_conclusive(response_text):
                 return True, "conclusive_response"
@@ -75,59 +220,31 @@ class CompletionDetector:
         This is a heuristic to detect when the agent is done without
         explicitly saying so.
         """
-        text_lower = text.lower()
-
-        # Check for phrases indicating the agent is about to START work (not conclusive)
-        starting_patterns = [
-            r"\blet'?s? start",
-            r"\bi'?ll (?:start|begin|create|write)",
-            r"\bi'?m (?:going to|about to)",
-            r"\bfirst,? (?:i'?ll|let'?s|we'?ll)",
-            r"\bnext,? (?:i'?ll|let'?s|we'?ll)",
-            r"\bstep \d+",
-            r"\bhere'?s? (?:the |a )?plan",
-            r"\bwe (?:can|will|should) (?:start|begin|create)",
-        ]
-
-        for pattern in starting_patterns:
-            if re.search(pattern, text_lower):
-                return False  # Not conclusive, agent is about to start
-
-        # Expanded patterns to catch genuine completions
-        conclusive_patterns = [
-            r"\b(done|completed|finished|ready)\b",
-            r"\b(successfully|all set|good to go)\b",
-            r"\bhere(?:'s| is) (?:the |a )?(?:poem|story|joke)",  # Only for creative content
-            r"\b(?:task|work|changes) (?:is |are )?(?:complete|done|finished)",
-            r"\blet me know if you need",
-            r"\bthat(?:'s| should do it)",
-            r"\beverything(?:'s| is) (?:set|ready|done)",
-            r"\bhope (?:this|that) helps",
-            r"\b(?:enjoy|hope you (?:like|enjoy))",
-            r"\b(?:there you go|here you are)",
-            r"\bfeel free to",
-            r"\bif you (?:need|want) (?:anything|more)",
-        ]
-
-        for pattern in conclusive_patterns:
-            if re.search(pattern, text_lower):
-                return True
+        # Cheap length check before any regex work: empty or near-empty
+        # responses can never match a conclusive phrase
+        if len(text) < CompletionDetector.MIN_CONCLUSIVE_LENGTH:
+            return False
+
+        # Sign-offs are only looked for in the last CONCLUSIVE_WINDOW
+        # characters, behind the substring pre-check. The regex searches from
+        # an offset (rather than the sliced window) so word boundaries at the
+        # window edge stay correct.
+        window_start = max(0, len(text) - CompletionDetector.CONCLUSIVE_WINDOW)
+        window = text[window_start:].casefold()
+        signed_off = any(
+            hint in window for hint in CompletionDetector.CONCLUSIVE_HINTS
+        ) and CompletionDetector._CONCLUSIVE_RE.search(text, window_start)
 
         # Only check creative content for ACTUAL creative content (poems, stories)
         # Don't treat plans or descriptions as complete
-        if len(text) > 300:  # Raised threshold
-            # Very specific creative markers - only for actual creative writing
-            specific_creative = [
-                r"\b(?:poem|haiku|limerick|sonnet)\b.*\n.*\n",  # Poem with line breaks
-                r"once upon a time",  # Story beginning
-                r"(?:roses are red|twinkle.*little star)",  # Nursery rhymes
-            ]
-
-            for marker in specific_creative:
-                if re.search(marker, text_lower, re.DOTALL):
-                    return True
+        if not signed_off and not (
+            len(text) > 300 and CompletionDetector._CREATIVE_RE.search(text)
+        ):
+            return False
 
-        return False
+        # An "I'll start..." anywhere vetoes completion, so this check needs
+        # the whole text; it only runs once one of the checks above matched
+        return not CompletionDetector._STARTING_RE.search(text)
 
 
 class AgentLoop:
@@ -137,6 +254,23 @@ class AgentLoop:
     Runs iteratively until the task is complete or max iterations reached.
     """
 
+    # An identical tool call seen this many times among the last
+    # REPEAT_CALL_WINDOW calls is not run again; the agent is told it is looping
+    REPEAT_CALL_LIMIT = 3
+    REPEAT_CALL_WINDOW = 20
+    # Tools that change files; repeating a read after one of these is expected
+    STATE_CHANGING_TOOLS = WRITE_TOOLS - {"run_bash"}
+    # Returned instead of re-running an identical read-only call
+    READ_CACHE_RESULT = {
+        "success": True,
+        "result": "[Same as the earlier identical call; nothing has changed since]",
+    }
+    # Sent after a turn with no tool calls, so the next request ends with a
+    # user message instead of two assistant messages in a row
+    NO_TOOL_CALLS_PROMPT = (
+        "Continue with the task, or reply TASK_COMPLETE if it is finished."
+    )
+
     def __init__(
         self,
         llm_client,
@@ -184,19 +318,72 @@ class AgentLoop:
 
         # Initialize tool result truncator if context management is enabled
         if context_manager:
-            from .context_manager import ToolResultTruncator
-
             max_chars = context_manager.config.get("max_tool_result_chars", 10000)
             self.truncator = ToolResultTruncator(max_chars=max_chars)
         else:
             self.truncator = None
 
         # Initialize stream buffer for clean display
-        if self.clean_display and StreamBuffer:
+        if self.clean_display:
+            from .animated_display import StreamBuffer
+
             self.stream_buffer = StreamBuffer(enabled=True)
         else:
             self.stream_buffer = None
 
+    def _execute_tool(self, tool_name: str, params: Dict) -> Dict:
+        """
+        Execute a single tool, isolating failures from the rest of the batch.
+
+        Args:
+            tool_name: Name of tool
+            params: Tool parameters
+
+        Returns:
+            Result dictionary
+        """
+        try:
+            return self.tool_executor.execute(tool_name, params)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Tool execution error: {str(e)}",
+            }
+
+    @staticmethod
+    def _call_fingerprint(tool_name: str, params: Dict) -> str:
+        """
+        Build a canonical key identifying a tool call.
+
+        Args:
+            tool_name: Name of tool
+            params: Tool parameters
+
+        Returns:
+            Key that is equal for calls with the same tool and parameters
+        """
+        return f"{tool_name}:{json.dumps(params, sort_keys=True, default=str)}"
+
+    @staticmethod
+    def _stringify_payload(payload) -> str:
+        """
+        Convert a tool result or error payload to message text.
+
+        Built-in tools return strings, which pass through untouched. Structured
+        payloads are rendered as JSON rather than a Python repr.
+
+        Args:
+            payload: Tool result or error value
+
+        Returns:
+            Payload as text
+        """
+        if isinstance(payload, str):
+            return payload
+        if isinstance(payload, (dict, list)):
+            return json.dumps(payload, default=str)
+        return str(payload)
+
     def run(
         self,
         messages: List[Dict],
@@ -223,20 +410,54 @@ class AgentLoop:
         iteration = 0
         total_tool_calls = 0
 
+        # Add max_tokens to stream_options if context manager is enabled. Built
+        # once per run and read-only, since it is shared by every iteration.
+        stream_opts = dict(self.stream_options)
+        stream_opts.setdefault("prompt_cache_key", AGENT_PROMPT_CACHE_KEY)
+        if self.context_manager and "max_tokens" not in stream_opts:
+            stream_opts["max_tokens"] = self.context_manager.max_output_tokens
+        stream_opts = MappingProxyType(stream_opts)
+
+        # Running token count of the messages already seen by the context manager
+        counted_tokens = 0
+        counted_messages = 0
+
+        # Fingerprints of recently executed tool calls, for loop detection
+        recent_calls = collections.deque(maxlen=self.REPEAT_CALL_WINDOW)
+        # Fingerprints of read-only calls whose results the model already has
+        read_calls = set()
+
+        # Bind attributes used on every iteration or streamed chunk to locals
+        max_iterations = self.max_iterations
+        stream_buffer = self.stream_buffer
+        find_marker = CompletionDetector.find_marker
+        marker_overlap = CompletionDetector.MARKER_OVERLAP
+
         try:
-            while iteration < self.max_iterations:
+            while iteration < max_iterations:
                 iteration += 1
 
                 console.print(
-                    f"\n[dim]→ Agent iteration {iteration}/{self.max_iterations}[/dim]"
+                    f"\n[dim]→ Agent iteration {iteration}/{max_iterations}[/dim]"
                 )
 
                 # Check and manage context before each LLM call
                 if self.context_manager:
                     messages, context_info = self.context_manager.check_and_manage(
-                        messages, reserve_output_tokens=True
+                        messages,
+                        reserve_output_tokens=True,
+                        prefix_tokens=counted_tokens,
+                        prefix_end=counted_messages,
                     )
+                    # Messages are only appended from here on, so the next
+                    # check only needs to count what this iteration adds
+                    counted_tokens = context_info["tokens_after"]
+                    counted_messages = len(messages)
                     if context_info.get("action_taken"):
+                        # Earlier tool results may have been trimmed or
+                        # summarized away, so repeated calls must run again
+                        read_calls.clear()
+                        recent_calls.clear()
                         console.print(
                             f"[yellow]→ Context managed: {context_info['action_taken']} "
                             f"({context_info['tokens_before']} → "
@@ -246,35 +467,42 @@ class AgentLoop:
                         )
 
                 console.print("[bold cyan]Assistant:[/bold cyan]")
-                chunks = []
+                response_buffer = io.StringIO()
+                printer = StreamPrinter()
+                explicit_marker = None
+                marker_tail = ""
                 suppressed_tool_calls = []
 
-                # Add max_tokens to stream_options if context manager is enabled
-                stream_opts = self.stream_options.copy()
-                if self.context_manager and "max_tokens" not in stream_opts:
-                    stream_opts["max_tokens"] = self.context_manager.max_output_tokens
-
                 try:
                     for chunk in self.llm_client.generate_streaming(
                         messages, stream_options=stream_opts
                     ):
                         # Process chunk through stream buffer if clean display enabled
-                        if self.stream_buffer:
-                            display_text, tool_call = self.stream_buffer.process_chunk(
-                                chunk
-                            )
+                        if stream_buffer:
+                            display_text, tool_call = stream_buffer.process_chunk(chunk)
                             if tool_call:
                                 suppressed_tool_calls.append(tool_call)
                             if display_text:
-                                console.print(display_text, end="")
+                                printer.write(display_text)
                         else:
-                            console.print(chunk, end="")
+                            printer.write(chunk)
 
-                        chunks.append(chunk)
+                        response_buffer.write(chunk)
 
+                        # Scan for completion markers as text arrives, so the
+                        # post-stream check doesn't rescan the whole response
+                        if explicit_marker is None:
+                            window = marker_tail + chunk
+                            explicit_marker = find_marker(window)
+                            marker_tail = window[-marker_overlap:]
+
+                    if stream_buffer:
+                        printer.write(stream_buffer.flush())
+                    printer.flush()
                     console.print("\n")
 
                 except Exception as e:
+                    printer.flush()
                     console.print(f"\n[red]Error during LLM generation: {e}[/red]")
                     return {
                         "success": False,
@@ -283,24 +511,32 @@ class AgentLoop:
                         "tool_calls": total_tool_calls,
                     }
 
-                response_text = "".join(chunks)
+                response_text = response_buffer.getvalue()
 
                 # Reset stream buffer for next iteration
-                if self.stream_buffer:
-                    self.stream_buffer.reset()
+                if stream_buffer:
+                    stream_buffer.reset()
 
                 messages.append({"role": "assistant", "content": response_text})
 
                 if display_callback:
                     display_callback(response_text)
 
-                tool_calls = tool_parser(response_text)
+                # A streamed marker or the iteration cap ends the run whatever
+                # the response contains, so skip parsing it for tool calls
+                if explicit_marker or iteration >= max_iterations:
+                    tool_calls = []
+                else:
+                    tool_calls = tool_parser(response_text)
+                has_tool_calls = len(tool_calls) > 0
 
                 is_complete, reason = CompletionDetector.is_complete(
                     response_text=response_text,
-                    has_tool_calls=len(tool_calls) > 0,
+                    has_tool_calls=has_tool_calls,
                     iteration=iteration,
-                    max_iterations=self.max_iterations,
+                    max_iterations=max_iterations,
+                    explicit_marker=explicit_marker,
+                    markers_checked=True,
                 )
 
                 if is_complete:
@@ -316,9 +552,9 @@ class AgentLoop:
                 if self.task_evaluator and user_request:
                     should_eval = self.task_evaluator.should_evaluate(
                         iteration=iteration,
-                        has_tool_calls=len(tool_calls) > 0,
+                        has_tool_calls=has_tool_calls,
                         response_length=len(response_text),
-                        max_iterations=self.max_iterations,
+                        max_iterations=max_iterations,
                     )
 
                     if should_eval:
@@ -356,8 +592,6 @@ class AgentLoop:
                                 "\n[yellow]→ Agent needs clarification[/yellow]"
                             )
                             if eval_result.user_question:
-                                from rich.prompt import Prompt
-
                                 user_response = Prompt.ask(
                                     f"[bold cyan]{eval_result.user_question}[/bold cyan]"
                                 )
@@ -368,6 +602,7 @@ class AgentLoop:
                                         "content": f"User clarification: {user_response}",
                                     }
                                 )
+                                read_calls.clear()
                                 continue
 
                         elif eval_result.status == "stuck":
@@ -381,8 +616,6 @@ class AgentLoop:
                                 )
 
                                 # Ask if user wants to intervene
-                                from rich.prompt import Prompt
-
                                 choice = Prompt.ask(
                                     "[bold]Continue or stop?[/bold]",
                                     choices=["continue", "stop", "help"],
@@ -410,13 +643,14 @@ class AgentLoop:
                                             "content": f"User guidance: {help_msg}",
                                         }
                                     )
+                                    read_calls.clear()
                                     continue
 
                 # Safety check: If agent keeps responding without tools at high iterations,
                 # it might be stuck. Only apply this after several iterations.
-                if not tool_calls and iteration >= 4:
+                if not has_tool_calls:
                     # Check if this looks like a stuck loop (agent keeps talking without acting)
-                    if len(response_text) > 50:
+                    if iteration >= 4 and len(response_text) > 50:
                         console.print(
                             "\n[yellow]→ Multiple iterations without tool calls. "
                             "Possible stuck loop detected.[/yellow]"
@@ -428,85 +662,170 @@ class AgentLoop:
                             "tool_calls": total_tool_calls,
                         }
 
-                if tool_calls:
-                    if len(tool_calls) > self.max_tools_per_turn:
-                        console.print(
-                            f"[yellow]⚠ Too many tool calls ({len(tool_calls)}), "
-                            f"limiting to {self.max_tools_per_turn}[/yellow]"
-                        )
-                        tool_calls = tool_calls[: self.max_tools_per_turn]
+                    console.print(
+                        "[yellow]⚠ No tool calls and task not marked complete. "
+                        "Continuing...[/yellow]"
+                    )
+                    messages.append(
+                        {"role": "user", "content": self.NO_TOOL_CALLS_PROMPT}
+                    )
+                    continue
 
-                    # Always show what tools are being executed
+                if len(tool_calls) > self.max_tools_per_turn:
                     console.print(
-                        f"\n[yellow]Executing {len(tool_calls)} tool(s)...[/yellow]\n"
+                        f"[yellow]⚠ Too many tool calls ({len(tool_calls)}), "
+                        f"limiting to {self.max_tools_per_turn}[/yellow]"
                     )
+                    tool_calls = tool_calls[: self.max_tools_per_turn]
+
+                fingerprints = [
+                    self._call_fingerprint(tool_name, params)
+                    for tool_name, params in tool_calls
+                ]
+
+                # Don't re-run calls the agent keeps repeating unchanged; the
+                # rest of the turn's calls still run
+                is_repeated = [
+                    recent_calls.count(fingerprint) >= self.REPEAT_CALL_LIMIT
+                    for fingerprint in fingerprints
+                ]
+                repeat_warning = None
+                if any(is_repeated):
+                    repeated_names = ", ".join(
+                        sorted(
+                            {
+                                tool_name
+                                for (tool_name, _), repeated in zip(
+                                    tool_calls, is_repeated
+                                )
+                                if repeated
+                            }
+                        )
+                    )
+                    console.print(
+                        f"\n[yellow]⚠ Repeated tool call skipped ({repeated_names}). "
+                        "Agent may be stuck in a loop.[/yellow]"
+                    )
+                    repeat_warning = (
+                        "[SYSTEM WARNING] You have already called "
+                        f"{repeated_names} with these exact parameters "
+                        f"{self.REPEAT_CALL_LIMIT} times and nothing has changed "
+                        "since, so those calls were not run again. Use the earlier "
+                        "results or try a different approach."
+                    )
+                    if all(is_repeated):
+                        messages.append({"role": "user", "content": repeat_warning})
+                        continue
+                    kept = [
+                        (call, fingerprint)
+                        for call, fingerprint, repeated in zip(
+                            tool_calls, fingerprints, is_repeated
+                        )
+                        if not repeated
+                    ]
+                    tool_calls = [call for call, _ in kept]
+                    fingerprints = [fingerprint for _, fingerprint in kept]
+                recent_calls.extend(fingerprints)
+
+                # Always show what tools are being executed
+                console.print(
+                    f"\n[yellow]Executing {len(tool_calls)} tool(s)...[/yellow]\n"
+                )
+
+                # Read-only calls already made since the last change are not
+                # run again; the model still has the earlier result. A turn
+                # that may change files neither uses nor fills the cache.
+                turn_writes = any(
+                    tool_name in WRITE_TOOLS for tool_name, _ in tool_calls
+                )
+                if turn_writes:
+                    read_calls.clear()
+                calls_to_run = [
+                    call
+                    for call, fingerprint in zip(tool_calls, fingerprints)
+                    if fingerprint not in read_calls
+                ]
 
                 # Execute tools
-                if self.tool_scheduler and len(tool_calls) > 1:
+                if self.tool_scheduler and len(calls_to_run) > 1:
                     # Parallel execution
-                    execution_results = self.tool_scheduler.execute_tools(tool_calls)
+                    fresh_results = self.tool_scheduler.execute_tools(calls_to_run)
                 else:
                     # Sequential execution
-                    execution_results = []
-                    for tool_name, params in tool_calls:
-                        result = self.tool_executor.execute(tool_name, params)
-                        execution_results.append(result)
-
-                tool_results = []
-                for (tool_name, parameters), result in zip(
-                    tool_calls, execution_results
+                    fresh_results = []
+                    for tool_name, params in calls_to_run:
+                        fresh_results.append(self._execute_tool(tool_name, params))
+
+                fresh_results = iter(fresh_results)
+                execution_results = [
+                    (
+                        self.READ_CACHE_RESULT
+                        if fingerprint in read_calls
+                        else next(fresh_results)
+                    )
+                    for fingerprint in fingerprints
+                ]
+
+                # Results are streamed into one buffer, header included, so the
+                # final message content is built without any extra copies
+                tool_results = io.StringIO()
+                tool_results.write("Tool execution results:\n\n")
+                state_changed = False
+                for index, ((tool_name, parameters), result) in enumerate(
+                    zip(tool_calls, execution_results)
                 ):
+                    success = result["success"]
+                    payload = result["result"] if success else result["error"]
+                    if success and tool_name in self.STATE_CHANGING_TOOLS:
+                        state_changed = True
+                    if success and tool_name in READ_ONLY_TOOLS and not turn_writes:
+                        read_calls.add(fingerprints[index])
+
+                    # Truncate tool results (and errors, though typically short)
+                    # if context management is enabled. Structured payloads are
+                    # truncated while rendering rather than rendered in full first.
+                    if self.truncator:
+                        payload_text = self.truncator.truncate_object(
+                            payload, tool_name
+                        )
+                    else:
+                        payload_text = self._stringify_payload(payload)
+
                     # Always show tool execution info (unless using display manager)
                     if self.display_manager:
                         self.display_manager.display_tool_call(tool_name, parameters)
                         self.display_manager.display_tool_result(
-                            tool_name, result, result["success"]
+                            tool_name, result, success
                         )
                     else:
                         # Show tool execution - clean display only affects spinners, not this
                         console.print(f"[cyan]→ Called {tool_name}[/cyan]")
-                        if result["success"]:
+                        if success:
                             console.print(f"[green]✓ {tool_name} succeeded[/green]")
                         else:
                             console.print(
-                                f"[red]✗ {tool_name} failed: {result['error']}[/red]"
+                                f"[red]✗ {tool_name} failed: {payload_text}[/red]"
                             )
 
-                    if result["success"]:
-                        result_text = str(result["result"])
-                        # Truncate tool result if context management is enabled
-                        if self.truncator:
-                            result_text = self.truncator.truncate_result(
-                                result_text, tool_name
-                            )
-                        tool_results.append(f"Tool: {tool_name}\nResult: {result_text}")
-                    else:
-                        error_text = str(result["error"])
-                        # Truncate error messages too (though typically short)
-                        if self.truncator:
-                            error_text = self.truncator.truncate_result(
-                                error_text, tool_name
-                            )
-                        tool_results.append(f"Tool: {tool_name}\nError: {error_text}")
+                    if index:
+                        tool_results.write("\n\n")
+                    tool_results.write(
+                        f"Tool: {tool_name}\n{'Result' if success else 'Error'}: "
+                    )
+                    tool_results.write(payload_text)
 
                     total_tool_calls += 1
 
-                tool_results_text = "\n\n".join(tool_results)
-                messages.append(
-                    {
-                        "role": "user",
-                        "content": f"Tool execution results:\n\n{tool_results_text}",
-                    }
-                )
-
-                continue
+                if repeat_warning:
+                    tool_results.write(f"\n\n{repeat_warning}")
+                messages.append({"role": "user", "content": tool_results.getvalue()})
 
-                console.print(
-                    "[yellow]⚠ No tool calls and task not marked complete. Continuing...[/yellow]"
-                )
+                # Files changed, so repeating earlier calls is no longer a loop
+                if state_changed:
+                    recent_calls.clear()
 
             console.print(
-                f"\n[yellow]⚠ Max iterations ({self.max_iterations}) reached[/yellow]"
+                f"\n[yellow]⚠ Max iterations ({max_iterations}) reached[/yellow]"
             )
             return {
                 "success": True,
@@ -518,3 +837,5 @@ class AgentLoop:
             # Clear running status when agent is done
             if self.session_stats:
                 self.session_stats.running_status = None
+            if self.tool_scheduler:
+                self.tool_scheduler.shutdown()
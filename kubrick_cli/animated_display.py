@@ -1,6 +1,7 @@
 """Animated display components for clean tool execution visualization."""
 
-import threading
+import json
+import re
 from typing import Optional
 
 from rich.console import Console
@@ -10,6 +11,11 @@ from rich.spinner import Spinner
 console = Console()
 
 
+def _shorten(text: str, limit: int) -> str:
+    """Cut text to at most limit characters, ending in "..." if cut."""
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
 class ToolSpinner:
     """Animated spinner for tool execution."""
 
@@ -25,6 +31,18 @@ class ToolSpinner:
         "default": {"verb": "Calling"},
     }
 
+    # Extracts the detail shown after the verb from a tool's parameters
+    DETAIL_BUILDERS = {
+        "write_file": lambda params: params.get("file_path", ""),
+        "edit_file": lambda params: params.get("file_path", ""),
+        "read_file": lambda params: params.get("file_path", ""),
+        # Truncate long commands
+        "run_bash": lambda params: _shorten(params.get("command", ""), 50),
+        "search_code": lambda params: (
+            f'"{params["pattern"]}"' if "pattern" in params else ""
+        ),
+    }
+
     def __init__(self, tool_name: str, parameters: dict):
         """
         Initialize tool spinner.
@@ -37,7 +55,6 @@ class ToolSpinner:
         self.parameters = parameters
         self.live = None
         self.spinner = None
-        self._stop_event = threading.Event()
 
         # Get tool-specific configuration
         config = self.TOOL_CONFIGS.get(tool_name, self.TOOL_CONFIGS["default"])
@@ -49,20 +66,8 @@ class ToolSpinner:
     def _build_message(self) -> str:
         """Build display message based on tool and parameters."""
         # Extract relevant parameter for display
-        detail = ""
-
-        if self.tool_name == "write_file" and "file_path" in self.parameters:
-            detail = self.parameters["file_path"]
-        elif self.tool_name == "edit_file" and "file_path" in self.parameters:
-            detail = self.parameters["file_path"]
-        elif self.tool_name == "read_file" and "file_path" in self.parameters:
-            detail = self.parameters["file_path"]
-        elif self.tool_name == "run_bash" and "command" in self.parameters:
-            cmd = self.parameters["command"]
-            # Truncate long commands
-            detail = cmd if len(cmd) <= 50 else cmd[:47] + "..."
-        elif self.tool_name == "search_code" and "pattern" in self.parameters:
-            detail = f'"{self.parameters["pattern"]}"'
+        build_detail = self.DETAIL_BUILDERS.get(self.tool_name)
+        detail = build_detail(self.parameters) if build_detail else ""
 
         if detail:
             return f"{self.verb} {detail}"
@@ -148,6 +153,13 @@ class StreamBuffer:
     allowing them to be suppressed and replaced with clean animations.
     """
 
+    TOOL_CALL_OPEN = "```tool_call"
+    TOOL_CALL_CLOSE = "```"
+    # Where to start looking for the closing fence ("```tool_call\n")
+    CLOSE_SEARCH_START = len(TOOL_CALL_OPEN) + 1
+    # Extracts the JSON between ```tool_call and ```
+    _TOOL_CALL_RE = re.compile(r"```tool_call\s*\n(.*?)\n```", re.DOTALL)
+
     def __init__(self, enabled: bool = True):
         """
         Initialize stream buffer.
@@ -156,15 +168,26 @@ class StreamBuffer:
             enabled: Whether to suppress tool calls (if False, shows raw output)
         """
         self.enabled = enabled
-        self.accumulated = ""  # All text accumulated so far
-        self.last_display_pos = 0  # Position up to which we've displayed
+        # Text not yet scanned. Between chunks this is at most a held-back
+        # partial marker, or text queued behind a just-completed tool call.
+        self.accumulated = ""
         self.in_tool_call = False
-        self.tool_call_start = -1
+        # Scanned text of the current tool call block, kept as parts and
+        # joined once when the block closes
+        self.tool_call_parts = []
+        self.tool_call_len = 0
+        # Last characters of the block, rescanned in case the closing fence
+        # is split across chunks
+        self.tool_call_tail = ""
 
     def process_chunk(self, chunk: str) -> tuple[str, Optional[dict]]:
         """
         Process a streaming chunk.
 
+        Each character is scanned once: only the new chunk plus a few
+        carried-over characters are searched, so a marker split across chunks
+        is still found and long tool calls are not rescanned or recopied.
+
         Args:
             chunk: Text chunk from LLM
 
@@ -174,49 +197,98 @@ class StreamBuffer:
         if not self.enabled:
             return chunk, None
 
-        # Add chunk to accumulated text
+        # Add chunk to the unscanned text
         self.accumulated += chunk
         display_text = ""
         tool_call = None
 
-        # Look for tool call markers in accumulated text
-        if not self.in_tool_call:
-            # Check if we're entering a tool call
-            tool_call_match = self.accumulated.find(
-                "```tool_call", self.last_display_pos
-            )
-            if tool_call_match >= 0:
-                # Display everything up to the tool call marker
-                display_text = self.accumulated[self.last_display_pos : tool_call_match]
-                self.last_display_pos = tool_call_match
+        while True:
+            if not self.in_tool_call:
+                tool_call_match = self.accumulated.find(self.TOOL_CALL_OPEN)
+                if tool_call_match < 0:
+                    # Display everything except a trailing partial marker,
+                    # which is held back until the next chunk decides it
+                    held = self._partial_open_length(self.accumulated)
+                    split = len(self.accumulated) - held
+                    display_text += self.accumulated[:split]
+                    self.accumulated = self.accumulated[split:]
+                    break
+
+                # Display everything up to the tool call marker and start
+                # collecting the block
+                display_text += self.accumulated[:tool_call_match]
+                block_start = tool_call_match + len(self.TOOL_CALL_OPEN)
+                self.accumulated = self.accumulated[block_start:]
                 self.in_tool_call = True
-                self.tool_call_start = tool_call_match
-            else:
-                # No tool call found - display the new chunk as normal
-                # Display everything from last position to current end
-                display_text = self.accumulated[self.last_display_pos :]
-                self.last_display_pos = len(self.accumulated)
-        else:
-            # We're in a tool call, look for the closing ```
-            # Find closing ``` after the opening
-            close_match = self.accumulated.find(
-                "```", self.tool_call_start + 13
-            )  # +13 for "```tool_call\n"
-            if close_match >= 0:
-                # Found end of tool call
-                # Extract and parse the tool call
-                tool_call_text = self.accumulated[
-                    self.tool_call_start : close_match + 3
-                ]
-                tool_call = self._parse_tool_call(tool_call_text)
-
-                # Skip past the entire tool call block
-                self.last_display_pos = close_match + 3
-                self.in_tool_call = False
-                self.tool_call_start = -1
+                self.tool_call_parts = [self.TOOL_CALL_OPEN]
+                self.tool_call_len = len(self.TOOL_CALL_OPEN)
+                self.tool_call_tail = self.TOOL_CALL_OPEN[-2:]
+
+            # One tool call per chunk; anything after it waits for the next
+            if tool_call is not None:
+                break
+
+            # We're in a tool call, look for the closing ``` in the new text
+            window = self.tool_call_tail + self.accumulated
+            window_offset = self.tool_call_len - len(self.tool_call_tail)
+            close_match = window.find(
+                self.TOOL_CALL_CLOSE,
+                max(0, self.CLOSE_SEARCH_START - window_offset),
+            )
+            if close_match < 0:
+                self.tool_call_parts.append(self.accumulated)
+                self.tool_call_len += len(self.accumulated)
+                self.tool_call_tail = window[-(len(self.TOOL_CALL_CLOSE) - 1) :]
+                self.accumulated = ""
+                break
+
+            # Found end of tool call: parse it and drop the whole block
+            block_end = (
+                close_match + len(self.TOOL_CALL_CLOSE) - len(self.tool_call_tail)
+            )
+            self.tool_call_parts.append(self.accumulated[:block_end])
+            tool_call = self._parse_tool_call("".join(self.tool_call_parts))
+            self.accumulated = self.accumulated[block_end:]
+            self.in_tool_call = False
+            self.tool_call_parts = []
+            self.tool_call_len = 0
 
         return display_text, tool_call
 
+    def flush(self) -> str:
+        """
+        Release text held back at the end of a stream.
+
+        Returns:
+            Pending text to display, minus any tool call blocks
+        """
+        # Drain tool calls left behind by a chunk that completed one
+        text, tool_call = self.process_chunk("")
+        while tool_call is not None:
+            more, tool_call = self.process_chunk("")
+            text += more
+
+        if self.in_tool_call:
+            return text  # Unfinished tool call stays suppressed
+        text += self.accumulated
+        self.accumulated = ""
+        return text
+
+    def _partial_open_length(self, text: str) -> int:
+        """
+        Length of the longest suffix of text that could start a tool call marker.
+
+        Args:
+            text: Pending text with no complete marker in it
+
+        Returns:
+            Number of trailing characters to hold back
+        """
+        for length in range(min(len(self.TOOL_CALL_OPEN) - 1, len(text)), 0, -1):
+            if text.endswith(self.TOOL_CALL_OPEN[:length]):
+                return length
+        return 0
+
     def _parse_tool_call(self, text: str) -> Optional[dict]:
         """
         Parse tool call JSON from text.
@@ -227,13 +299,8 @@ class StreamBuffer:
         Returns:
             Parsed tool call dict or None if parsing fails
         """
-        import json
-        import re
-
         try:
-            # Extract JSON between ```tool_call and ```
-            pattern = r"```tool_call\s*\n(.*?)\n```"
-            match = re.search(pattern, text, re.DOTALL)
+            match = self._TOOL_CALL_RE.search(text)
             if match:
                 json_str = match.group(1).strip()
                 return json.loads(json_str)
@@ -245,6 +312,7 @@ class StreamBuffer:
     def reset(self):
         """Reset buffer state."""
         self.accumulated = ""
-        self.last_display_pos = 0
         self.in_tool_call = False
-        self.tool_call_start = -1
+        self.tool_call_parts = []
+        self.tool_call_len = 0
+        self.tool_call_tail = ""
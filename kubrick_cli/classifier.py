@@ -1,6 +1,11 @@
 """Task complexity classification for intelligent routing."""
 
+import collections
+import concurrent.futures
+import hashlib
 import json
+import re
+import threading
 from dataclasses import dataclass
 from typing import Dict, List
 
@@ -8,66 +13,43 @@ from rich.console import Console
 
 console = Console()
 
+JSON_DECODER = json.JSONDecoder()
+
+# Lets hosted providers cache the classifier prompt across requests
+CLASSIFIER_PROMPT_CACHE_KEY = "kubrick-classifier-v1"
+
+# Asks providers with structured output for a reply matching
+# TaskClassification, so it never comes wrapped in prose
+CLASSIFICATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "task_classification",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "complexity": {
+                    "type": "string",
+                    "enum": ["CONVERSATIONAL", "SIMPLE", "COMPLEX"],
+                },
+                "reasoning": {"type": "string"},
+                "estimated_tool_calls": {"type": "integer"},
+                "requires_tools": {"type": "boolean"},
+            },
+            "required": [
+                "complexity",
+                "reasoning",
+                "estimated_tool_calls",
+                "requires_tools",
+            ],
+            "additionalProperties": False,
+        },
+    },
+}
 
-@dataclass
-class TaskClassification:
-    """Result of task classification."""
-
-    complexity: str  # CONVERSATIONAL, SIMPLE, COMPLEX
-    reasoning: str
-    estimated_tool_calls: int
-    requires_tools: bool
-
-
-class TaskClassifier:
-    """
-    Classifies tasks into three tiers to determine execution strategy.
-
-    CONVERSATIONAL:
-    - Greetings, questions, general chat
-    - No tool calls needed
-    - Single-turn response sufficient
-
-    SIMPLE:
-    - Single file operations
-    - Clear, specific scope
-    - Estimated 1-5 tool calls
-    - Low iteration count (3-5)
-
-    COMPLEX:
-    - Multi-file operations
-    - Architectural changes
-    - Uncertain scope
-    - Estimated >5 tool calls
-    - Full iteration count (15)
-    """
-
-    def __init__(self, llm_client):
-        """
-        Initialize task classifier.
-
-        Args:
-            llm_client: LLM client instance for classification
-        """
-        self.llm_client = llm_client
-
-    def classify(
-        self, user_message: str, conversation_history: List[Dict] = None
-    ) -> TaskClassification:
-        """
-        Classify a task into CONVERSATIONAL, SIMPLE, or COMPLEX.
-
-        Args:
-            user_message: The user's task request
-            conversation_history: Optional conversation context
-
-        Returns:
-            TaskClassification object with detailed classification
-        """
-        classification_messages = [
-            {
-                "role": "system",
-                "content": """You are a task complexity classifier for a coding assistant.
+# Static system prompt for classification. Kept at module level so every
+# request starts with an identical prefix.
+CLASSIFIER_SYSTEM_PROMPT = """You are a task complexity classifier for a coding assistant.
 
 Your job is to classify tasks into three tiers: CONVERSATIONAL, SIMPLE, or COMPLEX.
 
@@ -144,22 +126,203 @@ OR
 }
 ```
 
-Respond with ONLY the JSON object, no other text.""",
-            },
-            {"role": "user", "content": user_message},
+Respond with ONLY the JSON object, no other text."""
+
+
+@dataclass(frozen=True)
+class TaskClassification:
+    """
+    Result of task classification.
+
+    Frozen because cached and fast-path results are shared between turns.
+    Slots are declared by hand since dataclass(slots=True) needs Python 3.10.
+    """
+
+    __slots__ = ("complexity", "reasoning", "estimated_tool_calls", "requires_tools")
+
+    complexity: str  # CONVERSATIONAL, SIMPLE, COMPLEX
+    reasoning: str
+    estimated_tool_calls: int
+    requires_tools: bool
+
+
+# A client error about response_format, which providers raise when the model
+# doesn't support structured output (e.g. "OpenAI API error 400: ...
+# 'response_format' of type 'json_schema' is not supported with this model")
+STRUCTURED_OUTPUT_REJECTED_RE = re.compile(
+    r"\b(?:400|422)\b.*(?:response_format|json_schema)", re.IGNORECASE | re.DOTALL
+)
+
+# Whole messages that are always small talk, classified without the LLM.
+# Deliberately narrow: anything with more to it goes to the model.
+CONVERSATIONAL_FAST_PATH_RE = re.compile(
+    r"^\s*(?:hi+|hello|hey|thanks|thank you|thx|good (?:morning|afternoon|evening)"
+    r"|how are you|what can you do|who are you|tell me a joke)"
+    r"(?: there| so much)?[\s!.?]*$",
+    re.IGNORECASE,
+)
+
+# Words (file names and paths included) that make up a classification cache key
+CACHE_KEY_WORD_RE = re.compile(r"[\w./-]*\w")
+
+# Politeness tokens dropped when normalizing a cache key, so
+# "Please read config.py" and "read config.py" share a cache entry
+CACHE_KEY_FILLER_WORDS = frozenset({"please", "pls", "kindly"})
+
+SMALL_TALK_CLASSIFICATION = TaskClassification(
+    complexity="CONVERSATIONAL",
+    reasoning="Greeting or small talk",
+    estimated_tool_calls=0,
+    requires_tools=False,
+)
+
+
+class TaskClassifier:
+    """
+    Classifies tasks into three tiers to determine execution strategy.
+
+    CONVERSATIONAL:
+    - Greetings, questions, general chat
+    - No tool calls needed
+    - Single-turn response sufficient
+
+    SIMPLE:
+    - Single file operations
+    - Clear, specific scope
+    - Estimated 1-5 tool calls
+    - Low iteration count (3-5)
+
+    COMPLEX:
+    - Multi-file operations
+    - Architectural changes
+    - Uncertain scope
+    - Estimated >5 tool calls
+    - Full iteration count (15)
+    """
+
+    # Classifications remembered when caching is enabled
+    DEFAULT_CACHE_SIZE = 512
+
+    def __init__(self, llm_client, cache_size: int = 0):
+        """
+        Initialize task classifier.
+
+        Args:
+            llm_client: LLM client instance for classification
+            cache_size: Number of classifications to remember, keyed by the
+                normalized message (0 disables caching)
+        """
+        self.llm_client = llm_client
+        self.cache_size = cache_size
+        self._cache = collections.OrderedDict()
+        # classify_batch classifies from several threads at once
+        self._cache_lock = threading.Lock()
+        # Cleared if the model rejects structured output
+        self.structured_output = True
+
+    @staticmethod
+    def _cache_key(user_message: str) -> str:
+        """
+        Build the cache key for a message.
+
+        This is plain text normalization, not semantic matching: messages
+        that differ only in case, whitespace, punctuation, or a politeness
+        word like "please" get the same key.
+
+        Args:
+            user_message: The user's request
+
+        Returns:
+            Hex digest of the normalized message
+        """
+        words = [
+            word
+            for word in CACHE_KEY_WORD_RE.findall(user_message.casefold())
+            if word not in CACHE_KEY_FILLER_WORDS
         ]
+        return hashlib.blake2b(
+            " ".join(words).encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    def _request_classification(self, classification_messages: List[Dict]) -> str:
+        """
+        Ask the LLM for a classification, preferring structured output.
+
+        Providers without structured output ignore the response format. If
+        the model rejects it, the request is retried as plain prompting and
+        structured output is not tried again. Other errors (network, rate
+        limits, timeouts) are raised as they are.
+
+        Args:
+            classification_messages: System prompt and user message
+
+        Returns:
+            Raw LLM response text
+        """
+        stream_options = {"prompt_cache_key": CLASSIFIER_PROMPT_CACHE_KEY}
+        if not self.structured_output:
+            return self.llm_client.generate(classification_messages, stream_options)
 
         try:
-            response = self.llm_client.generate(
-                classification_messages, stream_options={}
+            return self.llm_client.generate(
+                classification_messages,
+                {**stream_options, "response_format": CLASSIFICATION_RESPONSE_FORMAT},
             )
+        except Exception as e:
+            if not STRUCTURED_OUTPUT_REJECTED_RE.search(str(e)):
+                raise
+            self.structured_output = False
+            return self.llm_client.generate(classification_messages, stream_options)
+
+    def classify(
+        self, user_message: str, conversation_history: List[Dict] = None
+    ) -> TaskClassification:
+        """
+        Classify a task into CONVERSATIONAL, SIMPLE, or COMPLEX.
+
+        Args:
+            user_message: The user's task request
+            conversation_history: Optional conversation context
+
+        Returns:
+            TaskClassification object with detailed classification
+        """
+        # Greetings and small talk are obvious; skip the LLM round trip
+        if CONVERSATIONAL_FAST_PATH_RE.match(user_message):
+            console.print(
+                "[dim]→ Task classified as CONVERSATIONAL: "
+                f"{SMALL_TALK_CLASSIFICATION.reasoning}[/dim]"
+            )
+            return SMALL_TALK_CLASSIFICATION
+
+        cache_key = None
+        if self.cache_size:
+            cache_key = self._cache_key(user_message)
+            with self._cache_lock:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache.move_to_end(cache_key)
+            if cached is not None:
+                console.print(
+                    f"[dim]→ Task classified as {cached.complexity} (cached): "
+                    f"{cached.reasoning}[/dim]"
+                )
+                return cached
+
+        classification_messages = [
+            {"role": "system", "content": CLASSIFIER_SYSTEM_PROMPT},
+            {"role": "user", "content": user_message},
+        ]
+
+        try:
+            response = self._request_classification(classification_messages)
 
             json_start = response.find("{")
-            json_end = response.rfind("}") + 1
 
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                result = json.loads(json_str)
+            if json_start >= 0:
+                # Decode the object in place; no slice of the response is made
+                # and text after the object (closing fences, notes) is ignored
+                result, _ = JSON_DECODER.raw_decode(response, json_start)
 
                 complexity = result.get("complexity", "SIMPLE").upper()
                 reasoning = result.get("reasoning", "No reasoning provided")
@@ -170,13 +333,22 @@ Respond with ONLY the JSON object, no other text.""",
                     f"[dim]→ Task classified as {complexity}: {reasoning}[/dim]"
                 )
 
-                return TaskClassification(
+                classification = TaskClassification(
                     complexity=complexity,
                     reasoning=reasoning,
                     estimated_tool_calls=estimated_tool_calls,
                     requires_tools=requires_tools,
                 )
 
+                # Only real classifications are cached, never the fallbacks
+                if cache_key is not None:
+                    with self._cache_lock:
+                        self._cache[cache_key] = classification
+                        if len(self._cache) > self.cache_size:
+                            self._cache.popitem(last=False)
+
+                return classification
+
             console.print(
                 "[yellow]⚠ Classification parsing failed, defaulting to SIMPLE[/yellow]"
             )
@@ -197,3 +369,27 @@ Respond with ONLY the JSON object, no other text.""",
                 estimated_tool_calls=3,
                 requires_tools=True,
             )
+
+    def classify_batch(
+        self, user_messages: List[str], max_workers: int = 4
+    ) -> List[TaskClassification]:
+        """
+        Classify several messages, sending their LLM requests concurrently.
+
+        Each request mostly waits on the network, so overlapping them on
+        threads hides most of the per-request latency. Identical messages
+        are classified once.
+
+        Args:
+            user_messages: Task requests to classify
+            max_workers: Maximum number of concurrent LLM requests
+
+        Returns:
+            Classifications in the same order as user_messages
+        """
+        unique_messages = list(dict.fromkeys(user_messages))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            classifications = dict(
+                zip(unique_messages, pool.map(self.classify, unique_messages))
+            )
+        return [classifications[message] for message in user_messages]
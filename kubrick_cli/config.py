@@ -1,14 +1,99 @@
 """Configuration management for Kubrick CLI."""
 
+import heapq
 import json
 import os
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+# Default configuration values. Copy before modifying; see
+# KubrickConfig._get_default_config
+DEFAULT_CONFIG: Dict[str, Any] = {
+    # Provider settings
+    "provider": "triton",
+    # Triton settings
+    "triton_url": "localhost:8000",
+    "triton_model": "llm_decoupled",
+    # OpenAI settings
+    "openai_api_key": None,
+    "openai_model": "gpt-4",
+    # Anthropic settings
+    "anthropic_api_key": None,
+    "anthropic_model": "claude-sonnet-4-5-20250929",
+    # Legacy compatibility
+    "model_name": "llm_decoupled",
+    "use_openai": False,
+    "default_working_dir": None,
+    # Agent loop settings
+    "max_iterations": 15,
+    "max_tools_per_turn": 5,
+    "total_timeout_seconds": 600,
+    "enable_parallel_tools": True,
+    "max_parallel_workers": 3,
+    # Task evaluator settings (intelligent completion detection)
+    "enable_task_evaluator": False,  # DISABLED - causes interference with tool calling
+    "evaluator_model": None,  # Use fast model if available, else main model
+    # Safety settings
+    "require_dangerous_command_confirmation": True,
+    "tool_timeout_seconds": 30,
+    "max_file_size_mb": 10,
+    # Display settings
+    "display_mode": "natural",
+    "show_tool_results": True,
+    "show_progress": True,
+    "clean_display": True,  # Suppress raw JSON tool calls (recommended)
+    # Task classification settings
+    "enable_task_classification": True,
+    "enable_classifier_cache": True,  # Reuse classifications of repeated messages
+    "classifier_model": None,  # Smaller model for classification, else main model
+    "enable_planning_phase": True,
+    # Conversation settings
+    "auto_save_conversations": True,
+    "max_conversations": 100,
+    # Context Management Settings
+    "enable_context_management": True,
+    "context_usage_threshold": 0.75,  # Start trimming at 75%
+    "context_summarization_threshold": 0.85,  # Summarize at 85%
+    "min_messages_to_keep": 4,  # Always preserve last 4 messages
+    "max_tool_result_chars": 10000,  # 10K chars per tool result
+    # Model-specific context windows (tokens)
+    "context_windows": {
+        # OpenAI models (most modern deployments support 128k for gpt-4)
+        "gpt-4": 128000,  # Modern GPT-4 (originally 8k, but 128k now standard)
+        "gpt-4-32k": 32768,
+        "gpt-4-turbo": 128000,
+        "gpt-4-turbo-preview": 128000,
+        "gpt-4o": 128000,
+        "gpt-4o-mini": 128000,
+        "gpt-3.5-turbo": 16385,
+        "gpt-3.5-turbo-16k": 16385,
+        # Anthropic models
+        "claude-sonnet-4-5-20250929": 200000,
+        "claude-opus-4-1-20250805": 200000,
+        "claude-haiku-4-5-20251001": 200000,
+        "claude-3-5-sonnet-20241022": 200000,
+        "claude-3-opus-20240229": 200000,
+        "claude-3-sonnet-20240229": 200000,
+        "claude-3-haiku-20240307": 200000,
+        # Triton/vLLM (conservative defaults)
+        "llm_decoupled": 32768,
+    },
+    "default_context_window": 16385,  # Fallback for unknown models
+    # Override for actual model max_model_len if different from defaults
+    # Set this to match your vLLM --max-model-len parameter
+    "model_max_context_override": None,  # e.g., 16000 for 16k context
+    # Maximum output tokens to reserve for generation
+    "max_output_tokens": 2048,  # Reserve tokens for LLM output
+}
+
 
 class KubrickConfig:
     """Manages Kubrick configuration and data directories."""
 
+    # Small file next to each conversation holding its listing summary, so
+    # listing never has to parse the full message history
+    META_SUFFIX = ".meta.json"
+
     def __init__(self, skip_wizard: bool = False):
         """
         Initialize config manager and ensure directories exist.
@@ -28,14 +113,21 @@ class KubrickConfig:
         self.config_file = self.kubrick_dir / "config.json"
         self.conversations_dir = self.kubrick_dir / "conversations"
 
+        # Conversation file name -> ((mtime_ns, size), listing summary), so
+        # listing only re-parses files that changed since the last listing
+        self._conversation_index = {}
+
         self._ensure_directories()
 
         self.config = self._load_config(skip_wizard=skip_wizard)
 
     def _ensure_directories(self):
         """Create necessary directories if they don't exist."""
-        self.kubrick_dir.mkdir(exist_ok=True)
-        self.conversations_dir.mkdir(exist_ok=True)
+        # One stat in the usual case; mkdir(exist_ok=True) on an existing
+        # directory costs a failed mkdir plus a stat each
+        if not self.conversations_dir.is_dir():
+            self.kubrick_dir.mkdir(exist_ok=True)
+            self.conversations_dir.mkdir(exist_ok=True)
 
     def _load_config(self, skip_wizard: bool = False) -> Dict[str, Any]:
         """
@@ -76,86 +168,17 @@ class KubrickConfig:
 
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration values."""
+        # The nested dict is copied too, so editing the result can't change
+        # the defaults
         return {
-            # Provider settings
-            "provider": "triton",
-            # Triton settings
-            "triton_url": "localhost:8000",
-            "triton_model": "llm_decoupled",
-            # OpenAI settings
-            "openai_api_key": None,
-            "openai_model": "gpt-4",
-            # Anthropic settings
-            "anthropic_api_key": None,
-            "anthropic_model": "claude-sonnet-4-5-20250929",
-            # Legacy compatibility
-            "model_name": "llm_decoupled",
-            "use_openai": False,
-            "default_working_dir": None,
-            # Agent loop settings
-            "max_iterations": 15,
-            "max_tools_per_turn": 5,
-            "total_timeout_seconds": 600,
-            "enable_parallel_tools": True,
-            "max_parallel_workers": 3,
-            # Task evaluator settings (intelligent completion detection)
-            "enable_task_evaluator": False,  # DISABLED - causes interference with tool calling
-            "evaluator_model": None,  # Use fast model if available, else main model
-            # Safety settings
-            "require_dangerous_command_confirmation": True,
-            "tool_timeout_seconds": 30,
-            "max_file_size_mb": 10,
-            # Display settings
-            "display_mode": "natural",
-            "show_tool_results": True,
-            "show_progress": True,
-            "clean_display": True,  # Suppress raw JSON tool calls (recommended)
-            # Task classification settings
-            "enable_task_classification": True,
-            "enable_planning_phase": True,
-            # Conversation settings
-            "auto_save_conversations": True,
-            "max_conversations": 100,
-            # Context Management Settings
-            "enable_context_management": True,
-            "context_usage_threshold": 0.75,  # Start trimming at 75%
-            "context_summarization_threshold": 0.85,  # Summarize at 85%
-            "min_messages_to_keep": 4,  # Always preserve last 4 messages
-            "max_tool_result_chars": 10000,  # 10K chars per tool result
-            # Model-specific context windows (tokens)
-            "context_windows": {
-                # OpenAI models (most modern deployments support 128k for gpt-4)
-                "gpt-4": 128000,  # Modern GPT-4 (originally 8k, but 128k now standard)
-                "gpt-4-32k": 32768,
-                "gpt-4-turbo": 128000,
-                "gpt-4-turbo-preview": 128000,
-                "gpt-4o": 128000,
-                "gpt-4o-mini": 128000,
-                "gpt-3.5-turbo": 16385,
-                "gpt-3.5-turbo-16k": 16385,
-                # Anthropic models
-                "claude-sonnet-4-5-20250929": 200000,
-                "claude-opus-4-1-20250805": 200000,
-                "claude-haiku-4-5-20251001": 200000,
-                "claude-3-5-sonnet-20241022": 200000,
-                "claude-3-opus-20240229": 200000,
-                "claude-3-sonnet-20240229": 200000,
-                "claude-3-haiku-20240307": 200000,
-                # Triton/vLLM (conservative defaults)
-                "llm_decoupled": 32768,
-            },
-            "default_context_window": 16385,  # Fallback for unknown models
-            # Override for actual model max_model_len if different from defaults
-            # Set this to match your vLLM --max-model-len parameter
-            "model_max_context_override": None,  # e.g., 16000 for 16k context
-            # Maximum output tokens to reserve for generation
-            "max_output_tokens": 2048,  # Reserve tokens for LLM output
+            **DEFAULT_CONFIG,
+            "context_windows": dict(DEFAULT_CONFIG["context_windows"]),
         }
 
     def _save_config(self, config: Dict[str, Any]):
         """Save configuration to file."""
-        with open(self.config_file, "w") as f:
-            json.dump(config, f, indent=2)
+        # Indented, since users edit this file by hand
+        self._write_json(self.config_file, config, indent=2)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get a configuration value."""
@@ -163,6 +186,10 @@ class KubrickConfig:
 
     def set(self, key: str, value: Any):
         """Set a configuration value and save."""
+        # Skip rewriting the file when nothing changes, e.g. the same
+        # --provider passed on every start
+        if key in self.config and self.config[key] == value:
+            return
         self.config[key] = value
         self._save_config(self.config)
 
@@ -180,7 +207,16 @@ class KubrickConfig:
             conversation_id: Unique identifier for the conversation (e.g., timestamp)
             messages: List of message dictionaries
             metadata: Optional metadata (working_dir, triton_url, etc.)
+
+        Raises:
+            ValueError: If the ID would be mistaken for a metadata file
         """
+        if f"{conversation_id}.json".endswith(self.META_SUFFIX):
+            raise ValueError(
+                f"Conversation ID can't end in '{self.META_SUFFIX[:-5]}': "
+                f"{conversation_id}"
+            )
+
         conversation_file = self.conversations_dir / f"{conversation_id}.json"
 
         data = {
@@ -189,8 +225,17 @@ class KubrickConfig:
             "metadata": metadata or {},
         }
 
-        with open(conversation_file, "w") as f:
-            json.dump(data, f, indent=2)
+        self._write_json(conversation_file, data)
+
+        summary = self._conversation_summary(data, conversation_id)
+        self._write_conversation_meta(conversation_id, summary)
+
+        # Index what was just written so listing doesn't read it back
+        stat = conversation_file.stat()
+        self._conversation_index[conversation_file.name] = (
+            (stat.st_mtime_ns, stat.st_size),
+            summary,
+        )
 
         self._cleanup_old_conversations()
 
@@ -213,13 +258,12 @@ class KubrickConfig:
             or "\\" in conversation_id
             or conversation_id.endswith(".json")
         ):
-            conversation_file = Path(conversation_id).expanduser().resolve()
+            conversation_file = Path(conversation_id).expanduser()
         else:
             conversation_file = self.conversations_dir / f"{conversation_id}.json"
 
-        if not conversation_file.exists():
-            return None
-
+        # A missing file fails the open below, so there's no separate
+        # existence check or symlink resolution
         try:
             with open(conversation_file, "r") as f:
                 return json.load(f)
@@ -237,30 +281,170 @@ class KubrickConfig:
             List of conversation metadata sorted by modification time (newest first)
         """
         conversations = []
+        index = {}
+
+        with os.scandir(self.conversations_dir) as entries:
+            json_entries = [e for e in entries if e.name.endswith(".json")]
+        meta_entries = {
+            e.name[: -len(self.META_SUFFIX)]: e
+            for e in json_entries
+            if e.name.endswith(self.META_SUFFIX)
+        }
 
-        for conv_file in self.conversations_dir.glob("*.json"):
+        for entry in json_entries:
+            if entry.name.endswith(self.META_SUFFIX):
+                continue
+            meta_stale = False
             try:
-                with open(conv_file, "r") as f:
-                    data = json.load(f)
-
-                conversations.append(
-                    {
-                        "id": data.get("id", conv_file.stem),
-                        "metadata": data.get("metadata", {}),
-                        "message_count": len(data.get("messages", [])),
-                        "modified": conv_file.stat().st_mtime,
-                    }
-                )
-            except (json.JSONDecodeError, IOError):
+                stat = entry.stat()
+                version = (stat.st_mtime_ns, stat.st_size)
+                cached = self._conversation_index.get(entry.name)
+                if cached and cached[0] == version:
+                    summary = cached[1]
+                else:
+                    summary = self._read_conversation_meta(
+                        entry, meta_entries.get(entry.name[:-5])
+                    )
+                    if summary is None:
+                        summary = self._read_conversation_summary(entry)
+                        meta_stale = True
+            except (OSError, ValueError, KeyError, TypeError):
+                # Unreadable or malformed file: skip it, keep listing the rest
                 continue
 
-        conversations.sort(key=lambda x: x["modified"], reverse=True)
+            if meta_stale:
+                self._write_conversation_meta(entry.name[:-5], summary)
+
+            index[entry.name] = (version, summary)
+            conversations.append({**summary, "modified": stat.st_mtime})
+
+        # Files deleted since the last listing drop out of the index
+        self._conversation_index = index
 
-        if limit:
-            conversations = conversations[:limit]
+        if limit and limit < len(conversations):
+            # Same order as sorting and slicing, without sorting everything
+            return heapq.nlargest(limit, conversations, key=lambda x: x["modified"])
 
+        conversations.sort(key=lambda x: x["modified"], reverse=True)
         return conversations
 
+    def _read_conversation_meta(
+        self, entry: os.DirEntry, meta_entry: Optional[os.DirEntry]
+    ) -> Optional[Dict]:
+        """
+        Read a conversation's listing summary from its metadata file.
+
+        Args:
+            entry: Directory entry of the conversation file
+            meta_entry: Directory entry of its metadata file, if any
+
+        Returns:
+            The summary, or None if the metadata file is missing, older than
+            the conversation, or unreadable
+        """
+        if not meta_entry or meta_entry.stat().st_mtime_ns < entry.stat().st_mtime_ns:
+            return None
+        try:
+            with open(meta_entry.path, "r") as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return summary if isinstance(summary, dict) else None
+
+    def _read_conversation_summary(self, entry: os.DirEntry) -> Dict:
+        """
+        Build a conversation's listing summary by parsing it in full.
+
+        Args:
+            entry: Directory entry of the conversation file
+
+        Returns:
+            Dictionary with 'id', 'metadata', and 'message_count'
+
+        Raises:
+            TypeError: If the file doesn't hold a conversation object
+        """
+        with open(entry.path, "r") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise TypeError(f"{entry.name} is not a conversation object")
+        return self._conversation_summary(data, entry.name[:-5])
+
+    def _write_conversation_meta(self, conversation_id: str, summary: Dict):
+        """
+        Write the metadata file for a conversation.
+
+        Best effort: if it can't be written (e.g. a read-only directory),
+        listing still works by parsing the conversation in full.
+
+        Args:
+            conversation_id: Conversation the summary describes
+            summary: Listing summary from _conversation_summary
+        """
+        meta_file = self.conversations_dir / f"{conversation_id}{self.META_SUFFIX}"
+        try:
+            # Not synced: a damaged metadata file is rebuilt from the conversation
+            self._write_json(meta_file, summary, sync=False)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _write_json(
+        path: Path, data: Any, indent: Optional[int] = None, sync: bool = True
+    ):
+        """
+        Write JSON to a file atomically.
+
+        The data goes to a temporary file next to path, which then replaces
+        path, so a crash mid-write never leaves a truncated file behind. A new
+        file gets the usual umask-based mode, a replaced file keeps its mode,
+        and a symlinked path has its target replaced instead.
+
+        Args:
+            path: File to write
+            data: JSON-serializable data
+            indent: Optional indent for human-readable output
+            sync: Flush the data to disk before replacing path, so a power
+                loss can't leave an empty file in its place
+        """
+        # json.dumps encodes in one pass (in C when not indenting), unlike
+        # json.dump, which always streams through the pure-Python encoder
+        text = json.dumps(data, indent=indent)
+        path = Path(os.path.realpath(path))
+        tmp_file = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp_file, "w") as f:
+                f.write(text)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            try:
+                os.chmod(tmp_file, os.stat(path).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_file, path)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _conversation_summary(data: Dict, default_id: str) -> Dict:
+        """
+        Build the listing entry for a conversation.
+
+        Args:
+            data: Conversation data as saved on disk
+            default_id: ID to use if the data has none (the file name)
+
+        Returns:
+            Dictionary with 'id', 'metadata', and 'message_count'
+        """
+        return {
+            "id": data.get("id", default_id),
+            "metadata": data.get("metadata", {}),
+            "message_count": len(data.get("messages", [])),
+        }
+
     def delete_conversation(self, conversation_id: str) -> bool:
         """
         Delete a conversation.
@@ -273,19 +457,35 @@ class KubrickConfig:
         """
         conversation_file = self.conversations_dir / f"{conversation_id}.json"
 
-        if conversation_file.exists():
+        try:
             conversation_file.unlink()
-            return True
-        return False
+        except FileNotFoundError:
+            return False
+
+        meta_file = self.conversations_dir / f"{conversation_id}{self.META_SUFFIX}"
+        meta_file.unlink(missing_ok=True)
+        return True
 
     def _cleanup_old_conversations(self):
         """Remove oldest conversations if we exceed max_conversations."""
         max_conversations = self.config.get("max_conversations", 100)
 
-        conversations = list(self.conversations_dir.glob("*.json"))
+        with os.scandir(self.conversations_dir) as entries:
+            conversations = [
+                entry
+                for entry in entries
+                if entry.name.endswith(".json")
+                and not entry.name.endswith(self.META_SUFFIX)
+            ]
 
+        # Nothing is stat'ed unless there is something to remove; DirEntry
+        # caches the stat, so each file is stat'ed once while sorting
         if len(conversations) > max_conversations:
-            conversations.sort(key=lambda x: x.stat().st_mtime)
+            conversations.sort(key=lambda entry: entry.stat().st_mtime)
 
-            for conv_file in conversations[: len(conversations) - max_conversations]:
-                conv_file.unlink()
+            for entry in conversations[: len(conversations) - max_conversations]:
+                os.remove(entry.path)
+                meta_file = self.conversations_dir / (
+                    entry.name[:-5] + self.META_SUFFIX
+                )
+                meta_file.unlink(missing_ok=True)
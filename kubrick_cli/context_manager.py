@@ -1,5 +1,7 @@
 """Context management for keeping conversations within model limits."""
 
+import collections
+import json
 from typing import Any, Dict, List, Tuple
 
 from rich.console import Console
@@ -112,12 +114,79 @@ class ToolResultTruncator:
 
         keep_start = int(self.max_chars * 0.7)
         keep_end = int(self.max_chars * 0.3)
-        truncated_chars = len(result_str) - self.max_chars
 
+        return self._join_truncated(
+            result_str[:keep_start],
+            result_str[-keep_end:],
+            len(result_str),
+            tool_name,
+        )
+
+    def truncate_object(self, result: Any, tool_name: str) -> str:
+        """
+        Render a tool result as text and truncate it like truncate_result.
+
+        Structured (dict or list) results are rendered as JSON piece by piece,
+        keeping only the beginning and a rolling window of the end once over
+        the limit, so a huge result is never built as one string.
+
+        Args:
+            result: Tool result value
+            tool_name: Name of the tool (for context in truncation message)
+
+        Returns:
+            Result text, truncated if it exceeds max_chars
+        """
+        if not isinstance(result, (dict, list)):
+            return self.truncate_result(result, tool_name)
+
+        pieces = json.JSONEncoder(default=str).iterencode(result)
+        head = []
+        total = 0
+        for piece in pieces:
+            head.append(piece)
+            total += len(piece)
+            if total > self.max_chars:
+                break
+        else:
+            return "".join(head)
+
+        keep_start = int(self.max_chars * 0.7)
+        keep_end = int(self.max_chars * 0.3)
+        start = "".join(head)
+
+        # Keep just enough trailing pieces to cover keep_end characters
+        tail = collections.deque([start[keep_start:]])
+        tail_len = len(tail[0])
+        for piece in pieces:
+            tail.append(piece)
+            tail_len += len(piece)
+            total += len(piece)
+            while len(tail) > 1 and tail_len - len(tail[0]) >= keep_end:
+                tail_len -= len(tail.popleft())
+
+        return self._join_truncated(
+            start[:keep_start], "".join(tail)[-keep_end:], total, tool_name
+        )
+
+    def _join_truncated(self, start: str, end: str, total: int, tool_name: str) -> str:
+        """
+        Join the kept beginning and end of a result around a truncation note.
+
+        Args:
+            start: Kept beginning of the result
+            end: Kept end of the result
+            total: Full length of the result
+            tool_name: Name of the tool (for context in truncation message)
+
+        Returns:
+            Truncated result
+        """
+        truncated_chars = total - self.max_chars
         return (
-            result_str[:keep_start]
+            start
             + f"\n\n... [truncated {truncated_chars} characters from {tool_name} output] ...\n\n"
-            + result_str[-keep_end:]
+            + end
         )
 
 
@@ -264,20 +333,30 @@ class ContextManager:
         )
 
     def check_and_manage(
-        self, messages: List[Dict], reserve_output_tokens: bool = True
+        self,
+        messages: List[Dict],
+        reserve_output_tokens: bool = True,
+        prefix_tokens: int = 0,
+        prefix_end: int = 0,
     ) -> Tuple[List[Dict], Dict]:
         """
         Check current token usage and manage context if needed.
 
+        Callers that only append to messages between calls can pass the
+        previous call's tokens_after and message count as prefix_tokens and
+        prefix_end, so only the newly appended messages are counted.
+
         Args:
             messages: Current conversation messages
             reserve_output_tokens: Whether to reserve tokens for LLM output (default: True)
+            prefix_tokens: Known token count of messages[:prefix_end]
+            prefix_end: Number of leading messages already counted
 
         Returns:
             Tuple of (managed_messages, metadata)
         """
-        current_tokens = self.token_counter.count_messages_tokens(
-            messages, self.provider_name
+        current_tokens = prefix_tokens + self.token_counter.count_messages_tokens(
+            messages[prefix_end:], self.provider_name
         )
 
         # Calculate available context (reserving space for output)
@@ -305,18 +384,21 @@ class ContextManager:
             messages = self._trim_messages(messages, target_tokens)
             metadata["action_taken"] = "trimmed"
 
-        current_tokens = self.token_counter.count_messages_tokens(
-            messages, self.provider_name
-        )
+        # Only recount if the messages were actually rewritten
+        if metadata["action_taken"]:
+            current_tokens = self.token_counter.count_messages_tokens(
+                messages, self.provider_name
+            )
 
         if current_tokens > available_context:
             console.print("[red]⚠ Context critically full. Emergency reset.[/red]")
             messages = self._emergency_reset(messages)
             metadata["action_taken"] = "emergency_reset"
+            current_tokens = self.token_counter.count_messages_tokens(
+                messages, self.provider_name
+            )
 
-        metadata["tokens_after"] = self.token_counter.count_messages_tokens(
-            messages, self.provider_name
-        )
+        metadata["tokens_after"] = current_tokens
 
         return messages, metadata
 
@@ -5,7 +5,6 @@ from typing import Any, Dict
 
 from rich.console import Console
 from rich.panel import Panel
-from rich.syntax import Syntax
 
 console = Console()
 
@@ -20,6 +19,10 @@ class DisplayManager:
     - verbose: Both natural + JSON
     """
 
+    # Longest string value rendered in a JSON panel. Syntax-highlighting a
+    # whole file's contents is slow and buries the rest of the output.
+    JSON_PREVIEW_CHARS = 2000
+
     def __init__(self, config: Dict):
         """
         Initialize display manager.
@@ -72,9 +75,9 @@ class DisplayManager:
 
     def _display_json_tool_call(self, tool_name: str, parameters: Dict[str, Any]):
         """Display tool call as JSON panel."""
-        tool_data = {"tool": tool_name, "parameters": parameters}
+        tool_data = {"tool": tool_name, "parameters": self._preview_values(parameters)}
         json_str = json.dumps(tool_data, indent=2)
-        syntax = Syntax(json_str, "json", theme="monokai", line_numbers=False)
+        syntax = self._highlight_json(json_str)
         console.print(Panel(syntax, title="Tool Call", border_style="cyan"))
 
     def _display_natural_result(
@@ -98,12 +101,42 @@ class DisplayManager:
         self, tool_name: str, result: Dict[str, Any], success: bool
     ):
         """Display result as JSON panel."""
-        json_str = json.dumps(result, indent=2)
-        syntax = Syntax(json_str, "json", theme="monokai", line_numbers=False)
+        json_str = json.dumps(self._preview_values(result), indent=2)
+        syntax = self._highlight_json(json_str)
         border_style = "green" if success else "red"
         title = f"Result: {tool_name}"
         console.print(Panel(syntax, title=title, border_style=border_style))
 
+    @staticmethod
+    def _highlight_json(json_str: str):
+        """Syntax-highlight JSON for a panel."""
+        # Imported here: rich.syntax pulls in pygments, which only the json
+        # and verbose display modes need, so natural mode starts faster
+        from rich.syntax import Syntax
+
+        return Syntax(json_str, "json", theme="monokai", line_numbers=False)
+
+    def _preview_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Shorten long string values for display in a JSON panel.
+
+        Args:
+            data: Tool parameters or result dictionary
+
+        Returns:
+            The original dict if nothing is too long, otherwise a shortened copy
+        """
+        limit = self.JSON_PREVIEW_CHARS
+        if not any(isinstance(v, str) and len(v) > limit for v in data.values()):
+            return data
+
+        preview = {}
+        for key, value in data.items():
+            if isinstance(value, str) and len(value) > limit:
+                value = f"{value[:limit]}... [{len(value) - limit} more characters]"
+            preview[key] = value
+        return preview
+
     def _get_natural_description(
         self, tool_name: str, parameters: Dict[str, Any]
     ) -> str:
@@ -2,23 +2,24 @@
 """Main CLI entry point for Kubrick."""
 
 import argparse
+import copy
 import json
 import re
 from datetime import datetime
 
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.table import Table
 
-from .agent_loop import AgentLoop
+from .agent_loop import AGENT_PROMPT_CACHE_KEY, AgentLoop, StreamPrinter
 from .classifier import TaskClassifier
 from .config import KubrickConfig
 from .display import DisplayManager
 from .evaluator import TaskEvaluator
 from .execution_strategy import ExecutionStrategy
 from .planning import PlanningPhase
+from .providers.base import ProviderAdapter
 from .providers.factory import ProviderFactory
 from .safety import SafetyConfig, SafetyManager
 from .scheduler import ToolScheduler
@@ -145,7 +146,27 @@ class KubrickCLI:
             session_stats=self.session_stats,
         )
 
-        self.classifier = TaskClassifier(self.provider)
+        classifier_cache_size = (
+            TaskClassifier.DEFAULT_CACHE_SIZE
+            if self.config.get("enable_classifier_cache", True)
+            else 0
+        )
+        # Classification is a short labeling task, so it can run on a smaller,
+        # faster model through a copy of the main provider
+        classifier_client = self.provider
+        classifier_model = self.config.get("classifier_model")
+        if classifier_model:
+            if type(self.provider).set_model is ProviderAdapter.set_model:
+                console.print(
+                    f"[yellow]⚠ {self.provider.provider_name} does not support model "
+                    f"selection, ignoring classifier_model[/yellow]"
+                )
+            else:
+                classifier_client = copy.copy(self.provider)
+                classifier_client.set_model(classifier_model)
+        self.classifier = TaskClassifier(
+            classifier_client, cache_size=classifier_cache_size
+        )
         self.planning_phase = PlanningPhase(
             llm_client=self.provider,
             tool_executor=self.tool_executor,
@@ -735,6 +756,10 @@ Assistant: I'll create the README and verify it was written.
         Returns:
             Full response text
         """
+        # Imported here: rich.markdown pulls in markdown-it and pygments,
+        # which would otherwise slow down every CLI start
+        from rich.markdown import Markdown
+
         full_text = "".join(chunks)
 
         parts = re.split(r"(```tool_call.*?```)", full_text, flags=re.DOTALL)
@@ -829,16 +854,21 @@ Assistant: I'll create the README and verify it was written.
         chunks = []
 
         stream_options = exec_config.hyperparameters.copy()
+        stream_options["prompt_cache_key"] = AGENT_PROMPT_CACHE_KEY
 
         # Add max_tokens if context manager is enabled
         if self.context_manager and "max_tokens" not in stream_options:
             stream_options["max_tokens"] = self.context_manager.max_output_tokens
 
-        for chunk in self.provider.generate_streaming(
-            self.messages, stream_options=stream_options
-        ):
-            console.print(chunk, end="")
-            chunks.append(chunk)
+        printer = StreamPrinter()
+        try:
+            for chunk in self.provider.generate_streaming(
+                self.messages, stream_options=stream_options
+            ):
+                printer.write(chunk)
+                chunks.append(chunk)
+        finally:
+            printer.flush()
 
         console.print("\n")
 
@@ -3,7 +3,6 @@
 from typing import Dict, List
 
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
 
@@ -225,6 +224,10 @@ Say "PLAN_COMPLETE" when your plan is ready.""",
         Returns:
             Dict with 'approved' (bool) and optional 'modifications' (str)
         """
+        # Imported here so that plain CLI startup doesn't load markdown-it
+        # and pygments; see display_streaming_response in main.py
+        from rich.markdown import Markdown
+
         console.print("\n" + "=" * 70)
         console.print(
             Panel(
@@ -31,6 +31,10 @@ class AnthropicProvider(ProviderAdapter):
         ],
     )
 
+    # Anthropic ignores cache_control on prompts under 1024 tokens (twice as
+    # many on Haiku models), roughly this many characters
+    MIN_CACHEABLE_CHARS = 4096
+
     def __init__(
         self,
         anthropic_api_key: str,
@@ -49,6 +53,21 @@ class AnthropicProvider(ProviderAdapter):
         self.timeout = 600
         self.api_version = "2023-06-01"
 
+    def _is_cacheable(self, system_message: str) -> bool:
+        """
+        Check whether a system prompt is long enough for prompt caching.
+
+        Args:
+            system_message: System prompt text
+
+        Returns:
+            True if marking it with cache_control can take effect
+        """
+        min_chars = self.MIN_CACHEABLE_CHARS
+        if "haiku" in self._model_name:
+            min_chars *= 2
+        return len(system_message) >= min_chars
+
     def generate_streaming(
         self, messages: List[Dict[str, str]], stream_options: Dict = None
     ) -> Iterator[str]:
@@ -86,6 +105,17 @@ class AnthropicProvider(ProviderAdapter):
                 payload["temperature"] = stream_options["temperature"]
             if "max_tokens" in stream_options:
                 payload["max_tokens"] = stream_options["max_tokens"]
+            if "prompt_cache_key" in stream_options and self._is_cacheable(
+                system_message
+            ):
+                # Mark the static system prompt as a cacheable prefix
+                payload["system"] = [
+                    {
+                        "type": "text",
+                        "text": system_message,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
 
         headers = {
             "Content-Type": "application/json",
@@ -68,6 +68,11 @@ class OpenAIProvider(ProviderAdapter):
                 payload["temperature"] = stream_options["temperature"]
             if "max_tokens" in stream_options:
                 payload["max_tokens"] = stream_options["max_tokens"]
+            if "prompt_cache_key" in stream_options:
+                # Routes requests sharing a static prefix to the same cache
+                payload["prompt_cache_key"] = stream_options["prompt_cache_key"]
+            if "response_format" in stream_options:
+                payload["response_format"] = stream_options["response_format"]
 
         headers = {
             "Content-Type": "application/json",
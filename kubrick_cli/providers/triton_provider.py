@@ -29,6 +29,9 @@ class TritonProvider(ProviderAdapter):
         ],
     )
 
+    # Stream options meant for hosted APIs, never sent to the Triton model
+    HOSTED_API_OPTIONS = frozenset({"prompt_cache_key", "response_format"})
+
     def __init__(self, triton_url: str = "localhost:8000", triton_model: str = "llm_decoupled"):
         """
         Initialize Triton provider.
@@ -54,6 +57,14 @@ class TritonProvider(ProviderAdapter):
         Yields:
             Text chunks as they arrive
         """
+        if stream_options and not self.HOSTED_API_OPTIONS.isdisjoint(stream_options):
+            # Triton forwards every option to the model, so drop the ones
+            # only hosted APIs understand
+            stream_options = {
+                k: v
+                for k, v in stream_options.items()
+                if k not in self.HOSTED_API_OPTIONS
+            }
         yield from self.client.generate_streaming(messages, stream_options)
 
     def generate(
@@ -69,7 +80,7 @@ class TritonProvider(ProviderAdapter):
         Returns:
             Complete response text
         """
-        return self.client.generate(messages, stream_options)
+        return "".join(self.generate_streaming(messages, stream_options))
 
     def is_healthy(self) -> bool:
         """
@@ -48,6 +48,21 @@ class ToolScheduler:
         self.tool_executor = tool_executor
         self.max_workers = max_workers
         self.enable_parallel = enable_parallel
+        self._pool = None
+
+    def _get_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Get the worker pool, created on first use and reused across turns."""
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers
+            )
+        return self._pool
+
+    def shutdown(self):
+        """Shut down the worker pool; the next parallel batch starts a new one."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
 
     def execute_tools(self, tool_calls: List[Tuple[str, Dict]]) -> List[Dict]:
         """
@@ -106,26 +121,27 @@ class ToolScheduler:
         Returns:
             Dict mapping index to result
         """
+        if len(indexed_calls) == 1:
+            return self._execute_sequential_indexed(indexed_calls)
+
         results = {}
 
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_workers
-        ) as executor:
-            future_to_index = {}
-            for index, tool_name, params in indexed_calls:
-                future = executor.submit(self._execute_single, tool_name, params)
-                future_to_index[future] = index
-
-            for future in concurrent.futures.as_completed(future_to_index):
-                index = future_to_index[future]
-                try:
-                    result = future.result()
-                    results[index] = result
-                except Exception as e:
-                    results[index] = {
-                        "success": False,
-                        "error": f"Parallel execution error: {str(e)}",
-                    }
+        executor = self._get_pool()
+        future_to_index = {}
+        for index, tool_name, params in indexed_calls:
+            future = executor.submit(self._execute_single, tool_name, params)
+            future_to_index[future] = index
+
+        for future in concurrent.futures.as_completed(future_to_index):
+            index = future_to_index[future]
+            try:
+                result = future.result()
+                results[index] = result
+            except Exception as e:
+                results[index] = {
+                    "success": False,
+                    "error": f"Parallel execution error: {str(e)}",
+                }
 
         return results
 
@@ -0,0 +1,324 @@
+"""Unit tests for AgentLoop (with mocked LLM client and tools)."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from kubrick_cli.agent_loop import AGENT_PROMPT_CACHE_KEY, AgentLoop
+from kubrick_cli.context_manager import ContextManager
+from kubrick_cli.scheduler import ToolScheduler
+
+TOOL_CALL = (
+    '```tool_call\n{"tool": "read_file", "parameters": {"file_path": "%s"}}\n```'
+)
+
+
+def parse_read_calls(text):
+    """Minimal tool parser: one read_file call per fenced block."""
+    calls = []
+    for block in text.split("```tool_call")[1:]:
+        file_path = block.split('"file_path": "')[1].split('"')[0]
+        calls.append(("read_file", {"file_path": file_path}))
+    return calls
+
+
+def make_llm(*responses):
+    """Create a mock LLM client that streams the given responses in order."""
+    llm = Mock()
+    llm.generate_streaming.side_effect = [iter([r]) for r in responses]
+    return llm
+
+
+@pytest.fixture
+def messages():
+    """Initial conversation messages."""
+    return [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": "Read two files"},
+    ]
+
+
+class TestAgentLoopToolExecution:
+    """Test suite for tool execution inside AgentLoop.run."""
+
+    def test_sequential_by_default(self, messages):
+        """Test that tools run sequentially without a scheduler."""
+        llm = make_llm(TOOL_CALL % "a.py" + TOOL_CALL % "b.py", "TASK_COMPLETE")
+        executor = Mock()
+        executor.execute.return_value = {"success": True, "result": "ok"}
+
+        loop = AgentLoop(llm, executor)
+        result = loop.run(messages, parse_read_calls)
+
+        assert result["success"] is True
+        assert result["tool_calls"] == 2
+        assert executor.execute.call_count == 2
+
+    def test_failure_is_isolated(self, messages):
+        """Test that one failing tool does not sink the rest of the turn."""
+        llm = make_llm(TOOL_CALL % "a.py" + TOOL_CALL % "b.py", "TASK_COMPLETE")
+
+        def execute(tool_name, params):
+            if params["file_path"] == "a.py":
+                raise RuntimeError("disk on fire")
+            return {"success": True, "result": "fine"}
+
+        executor = Mock()
+        executor.execute.side_effect = execute
+
+        loop = AgentLoop(llm, executor)
+        loop.run(messages, parse_read_calls)
+
+        tool_message = messages[3]["content"]
+        assert "Error: Tool execution error: disk on fire" in tool_message
+        assert "Result: fine" in tool_message
+
+    def test_scheduler_shut_down_after_run(self, messages):
+        """Test that the scheduler's worker pool is released when run ends."""
+        llm = make_llm(TOOL_CALL % "a.py" + TOOL_CALL % "b.py", "TASK_COMPLETE")
+        executor = Mock()
+        executor.execute.return_value = {"success": True, "result": "ok"}
+        scheduler = ToolScheduler(executor, max_workers=2)
+
+        result = AgentLoop(llm, executor, tool_scheduler=scheduler).run(
+            messages, parse_read_calls
+        )
+
+        assert result["tool_calls"] == 2
+        assert scheduler._pool is None
+
+    def test_only_long_results_truncated(self, messages):
+        """Test that results over the limit are truncated and others kept."""
+        llm = make_llm(TOOL_CALL % "a.py" + TOOL_CALL % "b.py", "TASK_COMPLETE")
+        context_manager = ContextManager(
+            "openai", "test-model", {"max_tool_result_chars": 100}
+        )
+        executor = Mock()
+        executor.execute.side_effect = lambda tool_name, params: {
+            "success": True,
+            "result": "x" * 500 if params["file_path"] == "a.py" else "short",
+        }
+
+        loop = AgentLoop(llm, executor, context_manager=context_manager)
+        loop.run(messages, parse_read_calls)
+
+        tool_message = messages[3]["content"]
+        assert "[truncated 400 characters from read_file output]" in tool_message
+        assert tool_message.endswith("Result: short")
+
+    def test_structured_result_rendered_as_json(self, messages):
+        """Test that dict results reach the model as JSON, not a repr."""
+        llm = make_llm(TOOL_CALL % "a.py", "TASK_COMPLETE")
+        executor = Mock()
+        executor.execute.return_value = {"success": True, "result": {"ok": True}}
+
+        AgentLoop(llm, executor).run(messages, parse_read_calls)
+
+        assert messages[3]["content"].endswith('Result: {"ok": true}')
+
+    def test_results_message_format(self, messages):
+        """Test the exact layout of the tool results message."""
+        llm = make_llm(TOOL_CALL % "a.py" + TOOL_CALL % "b.py", "TASK_COMPLETE")
+        executor = Mock()
+        executor.execute.side_effect = [
+            {"success": True, "result": "one"},
+            {"success": False, "error": "two"},
+        ]
+
+        AgentLoop(llm, executor).run(messages, parse_read_calls)
+
+        assert messages[3]["content"] == (
+            "Tool execution results:\n\n"
+            "Tool: read_file\nResult: one\n\n"
+            "Tool: read_file\nError: two"
+        )
+
+    def test_no_tool_calls_sends_nudge(self, messages):
+        """Test that a turn without tool calls is followed by a short user nudge."""
+        llm = make_llm("Let me look into it", "TASK_COMPLETE")
+        executor = Mock()
+
+        result = AgentLoop(llm, executor).run(messages, parse_read_calls)
+
+        assert result["iterations"] == 2
+        assert [m["role"] for m in messages[2:]] == ["assistant", "user", "assistant"]
+        assert messages[3]["content"] == AgentLoop.NO_TOOL_CALLS_PROMPT
+        executor.execute.assert_not_called()
+
+    def test_requests_carry_prompt_cache_key(self, messages):
+        """Test that every request asks providers to cache the system prompt."""
+        llm = make_llm("TASK_COMPLETE")
+
+        AgentLoop(llm, Mock(), stream_options={"temperature": 0.4}).run(
+            messages, parse_read_calls
+        )
+
+        stream_options = llm.generate_streaming.call_args.kwargs["stream_options"]
+        assert stream_options["prompt_cache_key"] == AGENT_PROMPT_CACHE_KEY
+        assert stream_options["temperature"] == 0.4
+
+
+class TestAgentLoopRepeatDetection:
+    """Test suite for skipping tool calls the agent keeps repeating."""
+
+    def test_fourth_identical_call_skipped(self, messages):
+        """Test that an identical call is not run past the repeat limit."""
+        llm = make_llm(*[TOOL_CALL % "a.py"] * 4, "TASK_COMPLETE")
+        executor = Mock()
+        executor.execute.return_value = {"success": True, "result": "same"}
+
+        result = AgentLoop(llm, executor).run(messages, parse_read_calls)
+
+        assert result["tool_calls"] == 3
+        assert messages[-2]["content"].startswith("[SYSTEM WARNING]")
+
+    def test_other_calls_in_turn_still_run(self, messages):
+        """Test that only the repeated call is skipped, with a warning naming it."""
+        llm = make_llm(
+            *[TOOL_CALL % "a.py"] * 3, TOOL_CALL % "a.py" + TOOL_CALL % "b.py", "[DONE]"
+        )
+        executor = Mock()
+        executor.execute.return_value = {"success": True, "result": "ok"}
+
+        result = AgentLoop(llm, executor).run(messages, parse_read_calls)
+
+        assert result["tool_calls"] == 4
+        assert executor.execute.call_args.args[1] == {"file_path": "b.py"}
+        assert messages[-2]["content"].startswith(
+            "Tool execution results:\n\nTool: read_file\nResult: ok\n\n"
+            "[SYSTEM WARNING] You have already called read_file"
+        )
+        assert "those calls were not run again" in messages[-2]["content"]
+
+    def test_context_management_resets_window(self, messages):
+        """Test that calls repeated after the context is trimmed run again."""
+        llm = make_llm(*[TOOL_CALL % "a.py"] * 4, "[DONE]")
+        executor = Mock()
+        executor.execute.return_value = {"success": True, "result": "ok"}
+        context_manager = Mock(config={}, max_output_tokens=100)
+        context_manager.check_and_manage.side_effect = lambda msgs, **kwargs: (
+            msgs,
+            {
+                "action_taken": "trimmed" if len(msgs) == 8 else None,
+                "tokens_before": 0,
+                "tokens_after": 0,
+                "reserved_output_tokens": 100,
+            },
+        )
+
+        result = AgentLoop(llm, executor, context_manager=context_manager).run(
+            messages, parse_read_calls
+        )
+
+        assert result["tool_calls"] == 4
+        assert not any("[SYSTEM WARNING]" in m["content"] for m in messages)
+
+    def test_file_change_resets_window(self, messages):
+        """Test that re-reading after an edit is not treated as a loop."""
+        edit = (
+            '```tool_call\n{"tool": "edit_file", "parameters": {"file_path": "a.py"}}'
+            "\n```"
+        )
+        llm = make_llm(*[TOOL_CALL % "a.py"] * 3, edit, TOOL_CALL % "a.py", "[DONE]")
+
+        def parse_calls(text):
+            if '"edit_file"' in text:
+                return [("edit_file", {"file_path": "a.py"})]
+            return parse_read_calls(text)
+
+        executor = Mock()
+        executor.execute.return_value = {"success": True, "result": "ok"}
+
+        result = AgentLoop(llm, executor).run(messages, parse_calls)
+
+        assert result["tool_calls"] == 5
+        assert not any("[SYSTEM WARNING]" in m["content"] for m in messages)
+        # The read after the edit runs again instead of reusing the cache
+        assert executor.execute.call_count == 3
+
+
+class TestAgentLoopReadCache:
+    """Test suite for reusing results of repeated read-only calls."""
+
+    def test_repeated_read_not_executed(self, messages):
+        """Test that an identical read is answered without running it."""
+        llm = make_llm(
+            TOOL_CALL % "a.py", TOOL_CALL % "a.py" + TOOL_CALL % "b.py", "[DONE]"
+        )
+        executor = Mock()
+        executor.execute.return_value = {"success": True, "result": "ok"}
+
+        result = AgentLoop(llm, executor).run(messages, parse_read_calls)
+
+        assert result["tool_calls"] == 3
+        assert [c.args[1] for c in executor.execute.call_args_list] == [
+            {"file_path": "a.py"},
+            {"file_path": "b.py"},
+        ]
+        assert messages[5]["content"] == (
+            "Tool execution results:\n\n"
+            "Tool: read_file\nResult: "
+            f"{AgentLoop.READ_CACHE_RESULT['result']}\n\n"
+            "Tool: read_file\nResult: ok"
+        )
+
+    def test_failed_read_not_cached(self, messages):
+        """Test that a failed read is retried when called again."""
+        llm = make_llm(TOOL_CALL % "a.py", TOOL_CALL % "a.py", "[DONE]")
+        executor = Mock()
+        executor.execute.side_effect = [
+            {"success": False, "error": "busy"},
+            {"success": True, "result": "ok"},
+        ]
+
+        AgentLoop(llm, executor).run(messages, parse_read_calls)
+
+        assert executor.execute.call_count == 2
+
+    def test_context_management_clears_cache(self, messages):
+        """Test that a read repeated after the context is trimmed runs again."""
+        llm = make_llm(TOOL_CALL % "a.py", TOOL_CALL % "a.py", "[DONE]")
+        executor = Mock()
+        executor.execute.return_value = {"success": True, "result": "ok"}
+        context_manager = Mock(config={}, max_output_tokens=100)
+        context_manager.check_and_manage.side_effect = lambda msgs, **kwargs: (
+            msgs,
+            {
+                "action_taken": "trimmed" if len(msgs) > 3 else None,
+                "tokens_before": 0,
+                "tokens_after": 0,
+                "reserved_output_tokens": 100,
+            },
+        )
+
+        AgentLoop(llm, executor, context_manager=context_manager).run(
+            messages, parse_read_calls
+        )
+
+        assert executor.execute.call_count == 2
+
+
+class TestAgentLoopMarkerDetection:
+    """Test suite for completion markers detected while streaming."""
+
+    def test_marker_split_across_chunks(self, messages):
+        """Test that a marker spanning two chunks is still detected."""
+        llm = Mock()
+        llm.generate_streaming.return_value = iter(["All finished. TASK_COM", "PLETE"])
+
+        result = AgentLoop(llm, Mock()).run(messages, parse_read_calls)
+
+        assert result["completion_reason"] == "explicit_marker:TASK_COMPLETE"
+        assert result["iterations"] == 1
+
+    def test_marker_skips_tool_parsing(self, messages):
+        """Test that a streamed marker ends the run without parsing tools."""
+        llm = make_llm(TOOL_CALL % "a.py" + " TASK_COMPLETE")
+        tool_parser = Mock(side_effect=parse_read_calls)
+        executor = Mock()
+
+        result = AgentLoop(llm, executor).run(messages, tool_parser)
+
+        assert result["completion_reason"] == "explicit_marker:TASK_COMPLETE"
+        tool_parser.assert_not_called()
+        executor.execute.assert_not_called()
@@ -0,0 +1,254 @@
+"""Unit tests for TaskClassifier (with a mocked LLM client)."""
+
+import dataclasses
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from kubrick_cli.classifier import CLASSIFICATION_RESPONSE_FORMAT, TaskClassifier
+
+
+def make_llm(complexity="SIMPLE"):
+    """Create a mock LLM client that always returns the given classification."""
+    llm = Mock()
+    llm.generate.return_value = json.dumps(
+        {
+            "complexity": complexity,
+            "reasoning": "test",
+            "estimated_tool_calls": 1,
+            "requires_tools": True,
+        }
+    )
+    return llm
+
+
+class TestTaskClassification:
+    """Test suite for the TaskClassification result type."""
+
+    def test_shared_results_are_immutable(self):
+        """Test that a cached or fast-path result cannot be changed by a caller."""
+        classification = TaskClassifier(make_llm()).classify("hi")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            classification.complexity = "COMPLEX"
+        assert not hasattr(classification, "__dict__")
+
+
+class TestTaskClassifierCache:
+    """Test suite for the classification cache."""
+
+    def test_disabled_by_default(self):
+        """Test that every call reaches the LLM without a cache size."""
+        llm = make_llm()
+        classifier = TaskClassifier(llm)
+
+        classifier.classify("Read config.py")
+        classifier.classify("Read config.py")
+
+        assert llm.generate.call_count == 2
+
+    def test_repeat_served_from_cache(self):
+        """Test that a repeated message, modulo case and whitespace, skips the LLM."""
+        llm = make_llm("CONVERSATIONAL")
+        classifier = TaskClassifier(llm, cache_size=4)
+
+        first = classifier.classify("Summarize the README")
+        second = classifier.classify("  summarize the readme \n")
+
+        assert llm.generate.call_count == 1
+        assert second is first
+
+    @pytest.mark.parametrize(
+        "variant",
+        [
+            "Please read config.py?",
+            "read config.py, please",
+            "READ  config.py",
+        ],
+    )
+    def test_normalized_repeat_served_from_cache(self, variant):
+        """Test that case, punctuation and "please" don't defeat the cache."""
+        llm = make_llm()
+        classifier = TaskClassifier(llm, cache_size=4)
+
+        classifier.classify("Read config.py")
+        classifier.classify(variant)
+
+        assert llm.generate.call_count == 1
+
+    def test_different_files_not_shared(self):
+        """Test that requests naming different files are classified separately."""
+        llm = make_llm()
+        classifier = TaskClassifier(llm, cache_size=4)
+
+        classifier.classify("Read config.py")
+        classifier.classify("Read config.json")
+
+        assert llm.generate.call_count == 2
+
+    def test_rephrasing_not_shared(self):
+        """Test that only politeness words are dropped from the cache key."""
+        llm = make_llm()
+        classifier = TaskClassifier(llm, cache_size=4)
+
+        classifier.classify("run the tests")
+        classifier.classify("can you run the tests")
+
+        assert llm.generate.call_count == 2
+
+    def test_least_recently_used_evicted(self):
+        """Test that the cache keeps at most cache_size entries."""
+        llm = make_llm()
+        classifier = TaskClassifier(llm, cache_size=2)
+
+        for message in ("a", "b", "a", "c", "a", "b"):
+            classifier.classify(message)
+
+        # "b" was evicted by "c" and had to be classified again
+        assert llm.generate.call_count == 4
+
+    def test_fallback_not_cached(self):
+        """Test that a failed classification is retried next time."""
+        llm = Mock()
+        llm.generate.side_effect = [RuntimeError("offline"), "not json"]
+        classifier = TaskClassifier(llm, cache_size=4)
+        classifier.structured_output = False
+
+        assert classifier.classify("Fix it").reasoning == "Error: offline"
+        assert classifier.classify("Fix it").reasoning == "Parsing failed"
+        assert llm.generate.call_count == 2
+
+
+class TestTaskClassifierFastPath:
+    """Test suite for classifying small talk without the LLM."""
+
+    @pytest.mark.parametrize(
+        "message", ["hi", "Hello!", "  hey there ", "Thanks so much.", "How are you?"]
+    )
+    def test_small_talk_skips_llm(self, message):
+        """Test that greetings and thanks are classified locally."""
+        llm = make_llm()
+
+        classification = TaskClassifier(llm).classify(message)
+
+        assert classification.complexity == "CONVERSATIONAL"
+        assert classification.requires_tools is False
+        llm.generate.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "message", ["hi, can you fix main.py?", "thanks, now add tests", "history"]
+    )
+    def test_other_messages_use_llm(self, message):
+        """Test that anything beyond plain small talk is sent to the LLM."""
+        llm = make_llm()
+
+        TaskClassifier(llm).classify(message)
+
+        llm.generate.assert_called_once()
+
+
+class TestTaskClassifierStructuredOutput:
+    """Test suite for requesting schema-shaped classification replies."""
+
+    def test_requests_response_format(self):
+        """Test that the classification schema is sent with the request."""
+        llm = make_llm()
+
+        TaskClassifier(llm).classify("Read config.py")
+
+        stream_options = llm.generate.call_args.args[1]
+        assert stream_options["response_format"] == CLASSIFICATION_RESPONSE_FORMAT
+
+    def test_rejected_format_falls_back_once(self):
+        """Test that a model without structured output is retried and remembered."""
+        llm = make_llm()
+        reply = llm.generate.return_value
+        llm.generate.side_effect = [
+            Exception(
+                "OpenAI API error 400: Invalid parameter: 'response_format' of type "
+                "'json_schema' is not supported with this model."
+            ),
+            reply,
+            reply,
+        ]
+        classifier = TaskClassifier(llm)
+
+        assert classifier.classify("Read config.py").reasoning == "test"
+        assert classifier.classify("Read main.py").reasoning == "test"
+
+        sent = [c.args[1] for c in llm.generate.call_args_list]
+        assert ["response_format" in options for options in sent] == [
+            True,
+            False,
+            False,
+        ]
+
+    def test_transient_error_keeps_structured_output(self):
+        """Test that a network or rate-limit error doesn't disable structured output."""
+        llm = make_llm()
+        reply = llm.generate.return_value
+        llm.generate.side_effect = [Exception("OpenAI API error 429: slow down"), reply]
+        classifier = TaskClassifier(llm)
+
+        assert (
+            classifier.classify("Read config.py").reasoning
+            == "Error: OpenAI API error 429: slow down"
+        )
+        assert classifier.classify("Read main.py").reasoning == "test"
+
+        assert classifier.structured_output is True
+        assert llm.generate.call_count == 2
+        assert "response_format" in llm.generate.call_args.args[1]
+
+
+class TestTaskClassifierParsing:
+    """Test suite for reading the classification out of the LLM reply."""
+
+    def test_json_inside_fences_and_prose(self):
+        """Test that the JSON object is found among surrounding text."""
+        llm = Mock()
+        llm.generate.return_value = (
+            'Sure:\n```json\n{"complexity": "complex", "reasoning": "many {files}"}'
+            "\n```\nLet me know {if} that helps."
+        )
+
+        classification = TaskClassifier(llm).classify("Refactor auth")
+
+        assert classification.complexity == "COMPLEX"
+        assert classification.reasoning == "many {files}"
+
+    def test_no_json_falls_back_to_simple(self):
+        """Test that a reply without JSON defaults to SIMPLE."""
+        llm = Mock()
+        llm.generate.return_value = "I think this is simple."
+
+        classification = TaskClassifier(llm).classify("Read config.py")
+
+        assert classification.complexity == "SIMPLE"
+        assert classification.reasoning == "Parsing failed"
+
+
+class TestTaskClassifierBatch:
+    """Test suite for classifying several messages at once."""
+
+    def test_requests_run_concurrently_in_order(self):
+        """Test that batch requests overlap and results keep input order."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def generate(messages, stream_options):
+            barrier.wait()  # Deadlocks unless both requests are in flight
+            complexity = "COMPLEX" if "Refactor" in messages[1]["content"] else "SIMPLE"
+            return json.dumps({"complexity": complexity})
+
+        llm = Mock()
+        llm.generate.side_effect = generate
+        classifier = TaskClassifier(llm, cache_size=4)
+
+        results = classifier.classify_batch(
+            ["Refactor auth", "Read config.py", "Refactor auth"]
+        )
+
+        assert [r.complexity for r in results] == ["COMPLEX", "SIMPLE", "COMPLEX"]
+        assert llm.generate.call_count == 2
@@ -1,5 +1,9 @@
 """Unit tests for CompletionDetector."""
 
+from unittest.mock import Mock
+
+import pytest
+
 from kubrick_cli.agent_loop import CompletionDetector
 
 
@@ -90,6 +94,18 @@ class TestCompletionDetector:
         assert is_complete is True
         assert reason == "max_iterations_reached"
 
+    def test_max_iterations_checked_before_markers(self):
+        """Test that the iteration cap is reported without scanning text."""
+        is_complete, reason = CompletionDetector.is_complete(
+            response_text="All done. TASK_COMPLETE",
+            has_tool_calls=False,
+            iteration=10,
+            max_iterations=10,
+        )
+
+        assert is_complete is True
+        assert reason == "max_iterations_reached"
+
     def test_conclusive_response_done(self):
         """Test detection of conclusive response with 'done'."""
         response = "I'm done with the task. Everything looks good!"
@@ -343,3 +359,75 @@ class TestCompletionDetector:
         )
         assert is_complete is True
         assert reason == "max_iterations_reached"
+
+    def test_explicit_marker_in_long_response(self):
+        """Test that a marker is found anywhere in a long response."""
+        response = "Working through the changes. " * 500 + "[DONE] All finished."
+
+        is_complete, reason = CompletionDetector.is_complete(
+            response_text=response,
+            has_tool_calls=True,
+            iteration=1,
+            max_iterations=10,
+        )
+
+        assert is_complete is True
+        assert reason == "explicit_marker:[DONE]"
+
+    def test_conclusive_patterns_ignore_case(self):
+        """Test that conclusive phrases match regardless of capitalization."""
+        assert CompletionDetector._looks_conclusive("Let me know if you need more")
+        assert CompletionDetector._looks_conclusive("DONE.")
+        assert not CompletionDetector._looks_conclusive("I'll start with the tests")
+        assert not CompletionDetector._looks_conclusive("First, I'll check. Done")
+
+    def test_conclusive_phrase_only_checked_near_end(self):
+        """Test that a sign-off buried early in a long response is ignored."""
+        response = "Step one is done. " + "Now reviewing the module. " * 60
+
+        assert CompletionDetector._looks_conclusive(response) is False
+        assert CompletionDetector._looks_conclusive(response + "All done.") is True
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            "Finished",
+            "Migrated successfully",
+            "You're good to go",
+            "Here is a poem for you",
+            "The work is complete",
+            "Let me know if you need changes",
+            "That should do it",
+            "Everything's ready",
+            "Hope this helps",
+            "Enjoy",
+            "There you go",
+            "Feel free to ask",
+            "If you want more, just say",
+        ],
+    )
+    def test_conclusive_hints_cover_patterns(self, response):
+        """Test that the substring pre-check never hides a conclusive phrase."""
+        assert CompletionDetector._looks_conclusive(response) is True
+
+    def test_regex_skipped_without_hints(self, monkeypatch):
+        """Test that responses with no conclusive hint skip the regex."""
+        conclusive_re = Mock()
+        monkeypatch.setattr(CompletionDetector, "_CONCLUSIVE_RE", conclusive_re)
+
+        assert (
+            CompletionDetector._looks_conclusive("Reading the config loader") is False
+        )
+        conclusive_re.search.assert_not_called()
+
+    def test_starting_check_only_after_a_match(self, monkeypatch):
+        """Test that the whole-text starting check runs only when needed."""
+        starting_re = Mock()
+        starting_re.search.return_value = None
+        monkeypatch.setattr(CompletionDetector, "_STARTING_RE", starting_re)
+
+        assert CompletionDetector._looks_conclusive("Reading the config") is False
+        starting_re.search.assert_not_called()
+
+        assert CompletionDetector._looks_conclusive("All done.") is True
+        starting_re.search.assert_called_once_with("All done.")
@@ -2,7 +2,10 @@
 """Test script for Kubrick configuration system."""
 
 from datetime import datetime
-from kubrick_cli.config import KubrickConfig
+
+import pytest
+
+from kubrick_cli.config import DEFAULT_CONFIG, KubrickConfig
 
 
 def test_config():
@@ -116,6 +119,216 @@ def test_config():
     print("")
 
 
+def test_list_conversations_reparses_only_changed_files(tmp_path, monkeypatch):
+    """Test that listing reuses summaries of files that haven't changed."""
+    import json
+    from unittest.mock import patch
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+    config.save_conversation("a", [{"role": "user", "content": "hi"}])
+    config.save_conversation("b", [])
+
+    with patch("kubrick_cli.config.json.load", wraps=json.load) as load:
+        assert {c["id"] for c in config.list_conversations()} == {"a", "b"}
+        assert load.call_count == 0
+
+        # Changed outside this process: only that file is read again
+        (config.conversations_dir / "b.json").write_text(
+            json.dumps({"id": "b", "messages": [{}, {}, {}]})
+        )
+        (config.conversations_dir / "a.json").unlink()
+        conversations = config.list_conversations()
+        assert load.call_count == 1
+
+    assert [(c["id"], c["message_count"]) for c in conversations] == [("b", 3)]
+
+
+def test_conversation_listing_uses_metadata_files(tmp_path, monkeypatch):
+    """Test that listing reads small metadata files, creating missing ones."""
+    import json
+    from pathlib import Path
+    from unittest.mock import patch
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+    config.save_conversation("new", [{"role": "user", "content": "hi"}])
+    assert (config.conversations_dir / "new.meta.json").exists()
+
+    # Saved before metadata files existed
+    (config.conversations_dir / "old.json").write_text(
+        json.dumps({"id": "old", "messages": [{}, {}]})
+    )
+
+    fresh = KubrickConfig(skip_wizard=True)
+    with patch("kubrick_cli.config.json.load", wraps=json.load) as load:
+        listed = {c["id"]: c["message_count"] for c in fresh.list_conversations()}
+
+    assert listed == {"new": 1, "old": 2}
+    read_files = [Path(call.args[0].name).name for call in load.call_args_list]
+    assert sorted(read_files) == [
+        "new.meta.json",
+        "old.json",
+    ]
+    assert (config.conversations_dir / "old.meta.json").exists()
+
+    assert fresh.delete_conversation("old") is True
+    assert not (config.conversations_dir / "old.meta.json").exists()
+
+
+def test_cleanup_removes_oldest_conversations(tmp_path, monkeypatch):
+    """Test that saving past max_conversations removes the oldest ones."""
+    import os
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+    config.config["max_conversations"] = 2
+
+    for age, conversation_id in enumerate(["c", "b", "a"]):
+        config.save_conversation(conversation_id, [])
+        conversation_file = config.conversations_dir / f"{conversation_id}.json"
+        os.utime(conversation_file, (1000 - age, 1000 - age))
+    config.save_conversation("d", [])
+
+    remaining = sorted(p.name for p in config.conversations_dir.iterdir())
+    assert remaining == ["c.json", "c.meta.json", "d.json", "d.meta.json"]
+
+
+def test_failed_save_keeps_previous_conversation(tmp_path, monkeypatch):
+    """Test that a write failing midway leaves the saved file intact."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+    config.save_conversation("conv", [{"role": "user", "content": "hi"}])
+
+    with pytest.raises(TypeError):
+        config.save_conversation("conv", [{"role": "user", "content": object()}])
+
+    assert config.load_conversation("conv")["messages"][0]["content"] == "hi"
+    assert not list(config.conversations_dir.glob("*.tmp"))
+
+
+def test_default_config_not_shared(tmp_path, monkeypatch):
+    """Test that changing one config's values leaves the defaults alone."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+    config.config["context_windows"]["gpt-4"] = 1
+
+    assert DEFAULT_CONFIG["context_windows"]["gpt-4"] == 128000
+    assert config._get_default_config()["context_windows"]["gpt-4"] == 128000
+
+
+def test_set_unchanged_value_skips_write(tmp_path, monkeypatch):
+    """Test that setting a key to its current value doesn't rewrite the file."""
+    from unittest.mock import Mock
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+    monkeypatch.setattr(config, "_save_config", Mock())
+
+    config.set("provider", config.get("provider"))
+    config._save_config.assert_not_called()
+
+    config.set("provider", "openai")
+    config._save_config.assert_called_once()
+
+
+def test_list_conversations_limit_keeps_newest(tmp_path, monkeypatch):
+    """Test that a limit returns the newest conversations, newest first."""
+    import os
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+    for mtime, conversation_id in enumerate(["b", "d", "a", "c"]):
+        config.save_conversation(conversation_id, [])
+        conversation_file = config.conversations_dir / f"{conversation_id}.json"
+        os.utime(conversation_file, (1000 + mtime, 1000 + mtime))
+
+    conversations = config.list_conversations(limit=2)
+
+    assert [c["id"] for c in conversations] == ["c", "a"]
+
+
+def test_delete_missing_conversation(tmp_path, monkeypatch):
+    """Test that deleting an unknown conversation reports it wasn't found."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+
+    assert config.delete_conversation("missing") is False
+
+
+def test_save_keeps_config_mode_and_symlink(tmp_path, monkeypatch):
+    """Test that saving keeps the config's permissions and symlink."""
+    import os
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+    target = tmp_path / "dotfiles" / "config.json"
+    target.parent.mkdir()
+    os.replace(config.config_file, target)
+    config.config_file.symlink_to(target)
+    os.chmod(target, 0o600)
+
+    config.set("openai_api_key", "sk-test")
+
+    assert config.config_file.is_symlink()
+    assert os.stat(target).st_mode & 0o777 == 0o600
+    assert '"sk-test"' in target.read_text()
+
+
+def test_new_files_follow_umask(tmp_path, monkeypatch):
+    """Test that newly written files get the umask default mode."""
+    import os
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    old_umask = os.umask(0o027)
+    try:
+        config = KubrickConfig(skip_wizard=True)
+    finally:
+        os.umask(old_umask)
+
+    assert os.stat(config.config_file).st_mode & 0o777 == 0o640
+
+
+def test_listing_survives_unwritable_metadata(tmp_path, monkeypatch):
+    """Test that conversations are still listed when metadata can't be written."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+    write_json = config._write_json
+
+    def failing_meta_write(path, data, **kwargs):
+        if path.name.endswith(KubrickConfig.META_SUFFIX):
+            raise PermissionError("read-only")
+        write_json(path, data, **kwargs)
+
+    monkeypatch.setattr(config, "_write_json", failing_meta_write)
+    config.save_conversation("conv", [{"role": "user", "content": "hi"}])
+
+    fresh = KubrickConfig(skip_wizard=True)
+    monkeypatch.setattr(fresh, "_write_json", failing_meta_write)
+
+    assert [c["id"] for c in fresh.list_conversations()] == ["conv"]
+
+
+@pytest.mark.parametrize("content", ["[1, 2]", '{"messages": 3}', '{"id": "x"', "null"])
+def test_listing_skips_malformed_conversation(tmp_path, monkeypatch, content):
+    """Test that one malformed conversation file doesn't break the listing."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+    config.save_conversation("good", [{"role": "user", "content": "hi"}])
+    (config.conversations_dir / "bad.json").write_text(content)
+
+    assert [c["id"] for c in config.list_conversations()] == ["good"]
+
+
+def test_metadata_like_conversation_id_rejected(tmp_path, monkeypatch):
+    """Test that an ID that would collide with a metadata file is refused."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = KubrickConfig(skip_wizard=True)
+
+    with pytest.raises(ValueError):
+        config.save_conversation("notes.meta", [])
+
+
 if __name__ == "__main__":
     import sys
 
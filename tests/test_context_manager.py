@@ -0,0 +1,83 @@
+"""Unit tests for ContextManager."""
+
+import json
+
+import pytest
+
+from kubrick_cli.context_manager import ContextManager, ToolResultTruncator
+
+
+@pytest.fixture
+def manager():
+    """Create a ContextManager with a small context window."""
+    return ContextManager(
+        provider_name="openai",
+        model_name="test-model",
+        config={"default_context_window": 1000, "max_output_tokens": 100},
+    )
+
+
+def make_messages(count):
+    """Create a conversation of fixed-size messages."""
+    messages = [{"role": "system", "content": "s" * 40}]
+    for i in range(count):
+        role = "user" if i % 2 == 0 else "assistant"
+        messages.append({"role": role, "content": "x" * 40})
+    return messages
+
+
+class TestContextManagerCheckAndManage:
+    """Test suite for ContextManager.check_and_manage."""
+
+    def test_under_threshold_untouched(self, manager):
+        """Test that messages under the threshold are returned as-is."""
+        messages = make_messages(3)
+
+        managed, info = manager.check_and_manage(messages)
+
+        assert managed is messages
+        assert info["action_taken"] is None
+        assert info["tokens_before"] == info["tokens_after"] == 4 * 12
+
+    def test_prefix_counts_match_full_count(self, manager):
+        """Test that incremental counting matches a full recount."""
+        messages = make_messages(3)
+        _, first = manager.check_and_manage(messages)
+
+        messages.extend(make_messages(2)[1:])
+        _, incremental = manager.check_and_manage(
+            messages, prefix_tokens=first["tokens_after"], prefix_end=4
+        )
+        _, full = manager.check_and_manage(messages)
+
+        assert incremental["tokens_after"] == full["tokens_after"] == 6 * 12
+
+    def test_over_threshold_summarizes(self, manager):
+        """Test that exceeding the summarization threshold compacts history."""
+        messages = make_messages(70)
+
+        managed, info = manager.check_and_manage(messages)
+
+        assert info["action_taken"] == "summarized"
+        assert info["tokens_after"] < info["tokens_before"]
+        assert managed[0] is messages[0]
+
+
+class TestToolResultTruncator:
+    """Test suite for ToolResultTruncator."""
+
+    @pytest.mark.parametrize("size", [5, 50, 500])
+    def test_object_matches_rendered_result(self, size):
+        """Test that truncating a structured result matches truncating its JSON."""
+        truncator = ToolResultTruncator(max_chars=100)
+        result = {"files": [f"src/module_{i}.py" for i in range(size)], "ok": True}
+
+        expected = truncator.truncate_result(json.dumps(result), "list_files")
+
+        assert truncator.truncate_object(result, "list_files") == expected
+
+    def test_object_passes_strings_through(self):
+        """Test that short string results come back unchanged."""
+        truncator = ToolResultTruncator(max_chars=100)
+
+        assert truncator.truncate_object("contents", "read_file") == "contents"
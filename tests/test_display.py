@@ -0,0 +1,25 @@
+"""Unit tests for DisplayManager."""
+
+from kubrick_cli.display import DisplayManager
+
+
+class TestDisplayManager:
+    """Test suite for DisplayManager class."""
+
+    def test_preview_keeps_short_values(self):
+        """Test that short payloads are displayed unchanged."""
+        display = DisplayManager({"display_mode": "json"})
+        result = {"success": True, "result": "short"}
+
+        assert display._preview_values(result) is result
+
+    def test_preview_shortens_long_values(self):
+        """Test that long string values are cut for JSON panels."""
+        display = DisplayManager({"display_mode": "json"})
+        result = {"success": True, "result": "x" * 2500}
+
+        preview = display._preview_values(result)
+
+        assert preview["success"] is True
+        assert preview["result"] == "x" * 2000 + "... [500 more characters]"
+        assert len(result["result"]) == 2500
@@ -0,0 +1,92 @@
+"""Unit tests for provider request payloads (no network access)."""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from kubrick_cli.providers.anthropic_provider import AnthropicProvider
+from kubrick_cli.providers.openai_provider import OpenAIProvider
+from kubrick_cli.providers.triton_provider import TritonProvider
+
+MESSAGES = [
+    {"role": "system", "content": "Static prompt"},
+    {"role": "user", "content": "Hi"},
+]
+
+
+def sent_payload(provider, module, stream_options, messages=MESSAGES):
+    """Run a request against a mocked connection and return the JSON payload."""
+    conn = Mock()
+    conn.getresponse.return_value.status = 200
+    conn.getresponse.return_value.read.return_value = b""
+
+    with patch(f"{module}.http.client.HTTPSConnection", return_value=conn):
+        provider.generate(messages, stream_options)
+
+    return json.loads(conn.request.call_args.kwargs["body"])
+
+
+class TestHostedApiOptions:
+    """Test suite for the prompt_cache_key and response_format stream options."""
+
+    def test_openai_forwards_key(self):
+        """Test that OpenAI receives the cache key as a request field."""
+        payload = sent_payload(
+            OpenAIProvider("key"),
+            "kubrick_cli.providers.openai_provider",
+            {"prompt_cache_key": "classifier"},
+        )
+
+        assert payload["prompt_cache_key"] == "classifier"
+
+    def test_anthropic_marks_long_system_prompt(self):
+        """Test that Anthropic caches a system prompt long enough to be cached."""
+        system_prompt = "Static prompt. " * 400
+        payload = sent_payload(
+            AnthropicProvider("key"),
+            "kubrick_cli.providers.anthropic_provider",
+            {"prompt_cache_key": "agent"},
+            [{"role": "system", "content": system_prompt}, MESSAGES[1]],
+        )
+
+        assert payload["system"] == [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
+    @pytest.mark.parametrize("stream_options", [{}, {"prompt_cache_key": "classifier"}])
+    def test_anthropic_short_system_prompt_left_plain(self, stream_options):
+        """Test that prompts below the caching minimum are sent as plain text."""
+        payload = sent_payload(
+            AnthropicProvider("key"),
+            "kubrick_cli.providers.anthropic_provider",
+            stream_options,
+        )
+
+        assert payload["system"] == "Static prompt"
+
+    def test_openai_forwards_response_format(self):
+        """Test that OpenAI receives the structured output format."""
+        response_format = {"type": "json_object"}
+        payload = sent_payload(
+            OpenAIProvider("key"),
+            "kubrick_cli.providers.openai_provider",
+            {"response_format": response_format},
+        )
+
+        assert payload["response_format"] == response_format
+
+    def test_triton_drops_hosted_options(self):
+        """Test that Triton never passes hosted-API options on to the model."""
+        provider = TritonProvider()
+        provider.client = Mock()
+        provider.client.generate_streaming.return_value = iter(["ok"])
+
+        options = {"prompt_cache_key": "x", "response_format": {}, "a": 1}
+
+        assert provider.generate(MESSAGES, options) == "ok"
+        provider.client.generate_streaming.assert_called_once_with(MESSAGES, {"a": 1})
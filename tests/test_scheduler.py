@@ -0,0 +1,69 @@
+"""Unit tests for ToolScheduler."""
+
+import threading
+from unittest.mock import Mock
+
+from kubrick_cli.scheduler import ToolScheduler
+
+
+class TestToolScheduler:
+    """Test suite for ToolScheduler class."""
+
+    def test_results_keep_call_order(self):
+        """Test that mixed read/write calls return results in input order."""
+        executor = Mock()
+        executor.execute.side_effect = lambda name, params: {
+            "success": True,
+            "result": params["path"],
+        }
+        calls = [
+            ("read_file", {"path": "a"}),
+            ("write_file", {"path": "b"}),
+            ("read_file", {"path": "c"}),
+        ]
+
+        results = ToolScheduler(executor).execute_tools(calls)
+
+        assert [r["result"] for r in results] == ["a", "b", "c"]
+
+    def test_reads_run_concurrently_on_reused_pool(self):
+        """Test that read-only calls run in parallel on a persistent pool."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def execute(name, params):
+            barrier.wait()  # Deadlocks unless both reads run concurrently
+            return {"success": True, "result": params["path"]}
+
+        executor = Mock()
+        executor.execute.side_effect = execute
+        scheduler = ToolScheduler(executor, max_workers=2)
+        calls = [("read_file", {"path": "a"}), ("list_files", {"path": "b"})]
+
+        scheduler.execute_tools(calls)
+        pool = scheduler._pool
+        scheduler.execute_tools(calls)
+
+        assert pool is not None
+        assert scheduler._pool is pool
+
+    def test_tool_exception_is_isolated(self):
+        """Test that a raising tool becomes an error result."""
+        executor = Mock()
+        executor.execute.side_effect = RuntimeError("boom")
+
+        results = ToolScheduler(executor).execute_tools([("run_bash", {})])
+
+        assert results == [{"success": False, "error": "Tool execution error: boom"}]
+
+    def test_shutdown_releases_pool(self):
+        """Test that shutdown drops the pool and a later batch starts a new one."""
+        executor = Mock()
+        executor.execute.return_value = {"success": True, "result": "ok"}
+        scheduler = ToolScheduler(executor, max_workers=2)
+        calls = [("read_file", {"path": "a"}), ("list_files", {"path": "b"})]
+
+        scheduler.execute_tools(calls)
+        scheduler.shutdown()
+
+        assert scheduler._pool is None
+        assert len(scheduler.execute_tools(calls)) == 2
@@ -0,0 +1,112 @@
+"""Unit tests for StreamBuffer."""
+
+import pytest
+
+from kubrick_cli.animated_display import StreamBuffer
+
+TOOL_BLOCK = (
+    '```tool_call\n{"tool": "read_file", "parameters": {"file_path": "a"}}\n```'
+)
+
+
+def feed(buffer, chunks):
+    """Feed chunks through the buffer, collecting display text and tool calls."""
+    displayed = []
+    tool_calls = []
+    for chunk in chunks:
+        text, tool_call = buffer.process_chunk(chunk)
+        displayed.append(text)
+        if tool_call is not None:
+            tool_calls.append(tool_call)
+    return "".join(displayed), tool_calls
+
+
+class TestStreamBuffer:
+    """Test suite for StreamBuffer class."""
+
+    @pytest.fixture
+    def buffer(self):
+        """Create an enabled StreamBuffer."""
+        return StreamBuffer(enabled=True)
+
+    def test_plain_text_passes_through(self, buffer):
+        """Test that text without tool calls is displayed as it arrives."""
+        displayed, tool_calls = feed(buffer, ["Hello ", "world"])
+
+        assert displayed == "Hello world"
+        assert tool_calls == []
+        assert buffer.accumulated == ""
+
+    def test_tool_call_suppressed_and_parsed(self, buffer):
+        """Test that a tool call block is hidden and returned parsed."""
+        chunks = ["Reading now.\n", TOOL_BLOCK[:20], TOOL_BLOCK[20:], "\nAll read."]
+
+        displayed, tool_calls = feed(buffer, chunks)
+
+        assert displayed == "Reading now.\n\nAll read."
+        assert tool_calls == [{"tool": "read_file", "parameters": {"file_path": "a"}}]
+
+    def test_long_tool_block_split_into_many_chunks(self, buffer):
+        """Test that a large tool call block is detected across many chunks."""
+        content = "x" * 5000
+        block = (
+            '```tool_call\n{"tool": "write_file", "parameters": {"content": "%s"}}\n```'
+            % content
+        )
+        chunks = [block[:13]] + [block[i : i + 7] for i in range(13, len(block), 7)]
+        chunks.append("\nok")
+
+        displayed, tool_calls = feed(buffer, chunks)
+
+        assert displayed == "\nok"
+        assert tool_calls[0]["parameters"]["content"] == content
+
+    def test_markers_split_across_chunks(self, buffer):
+        """Test that opening and closing fences split mid-token are detected."""
+        text = "Reading now.\n" + TOOL_BLOCK + "\nAll read."
+        chunks = [text[i : i + 2] for i in range(0, len(text), 2)]
+
+        displayed, tool_calls = feed(buffer, chunks)
+        displayed += buffer.flush()
+
+        assert displayed == "Reading now.\n\nAll read."
+        assert len(tool_calls) == 1
+
+    def test_flush_releases_held_back_text(self, buffer):
+        """Test that a trailing code fence is held back until flushed."""
+        displayed, _ = feed(buffer, ["print(1)\n", "```"])
+
+        assert displayed == "print(1)\n"
+        assert buffer.flush() == "```"
+
+    def test_flush_displays_text_after_tool_calls(self, buffer):
+        """Test that a whole response in one chunk is fully displayed."""
+        text = "A\n" + TOOL_BLOCK + "\nB\n" + TOOL_BLOCK + "\nC"
+
+        displayed, tool_calls = feed(buffer, [text])
+        displayed += buffer.flush()
+
+        assert displayed == "A\n\nB\n\nC"
+        assert len(tool_calls) == 1
+
+    def test_invalid_json_is_dropped(self, buffer):
+        """Test that a malformed tool call is suppressed without a result."""
+        displayed, tool_calls = feed(
+            buffer, ["before ", "```tool_call\nnot json\n", "```", " after"]
+        )
+
+        assert displayed == "before  after"
+        assert tool_calls == []
+
+    def test_disabled_returns_raw_chunks(self):
+        """Test that a disabled buffer shows raw output."""
+        buffer = StreamBuffer(enabled=False)
+
+        assert buffer.process_chunk(TOOL_BLOCK) == (TOOL_BLOCK, None)
+
+    def test_reset_clears_state(self, buffer):
+        """Test that reset discards a partially streamed tool call."""
+        buffer.process_chunk("```tool_call\n{")
+        buffer.reset()
+
+        assert buffer.process_chunk("fresh") == ("fresh", None)
@@ -0,0 +1,23 @@
+"""Unit tests for ToolSpinner."""
+
+import pytest
+
+from kubrick_cli.animated_display import ToolSpinner
+
+
+class TestToolSpinner:
+    """Test suite for the tool spinner."""
+
+    @pytest.mark.parametrize(
+        "tool_name, parameters, message",
+        [
+            ("read_file", {"file_path": "a.py"}, "Reading a.py"),
+            ("edit_file", {}, "Calling edit_file"),
+            ("run_bash", {"command": "x" * 60}, "Running " + "x" * 47 + "..."),
+            ("search_code", {"pattern": "def"}, 'Searching "def"'),
+            ("list_files", {"pattern": "*.py"}, "Calling list_files"),
+        ],
+    )
+    def test_build_message(self, tool_name, parameters, message):
+        """Test the spinner message for each kind of tool."""
+        assert ToolSpinner(tool_name, parameters).message == message